@@ -4,20 +4,35 @@ Creates and configures the Flask application
 """
 
 import os
+import atexit
+import queue
+import orjson
 from flask_cors import CORS
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener
 from flask import Flask, jsonify
+from flask.logging import default_handler
 from flask_cors import CORS
 
 from app.config import Config
 from app.extensions import close_db, init_db
+from app.middleware.auth_middleware import init_auth
 from app.routes.auth_routes import auth_bp
 from app.routes.task_routes import task_bp
+from app.utils.json_provider import OrjsonProvider
+from app.utils.log_handlers import BufferedRotatingFileHandler
+from app.utils.token_cache import init_token_cache
+
+# Logging handlers installed on the shared 'app' logger, as
+# (settings, queue handler, listener); set by setup_logging()
+_log_setup = None
 
 
 def create_app(config_class=Config):
     app = Flask(__name__)
+    
+    # Serialize JSON with orjson
+    app.json = OrjsonProvider(app)
 
     # Load configuration FIRST
     app.config.from_object(config_class)
@@ -29,6 +44,12 @@ def create_app(config_class=Config):
 
     # Initialize database connection pool
     init_db(app)
+    
+    # Bind JWT settings
+    init_auth(app)
+    
+    # Token validation cache / revocation list (Redis if configured)
+    init_token_cache(app)
 
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/v1/auth')
@@ -66,7 +87,40 @@ def setup_logging(app):
     """
     Configure application logging
     Logs to both file and console
+    
+    Records are queued by the request thread and written by a
+    background QueueListener, so file I/O stays off the request path
     """
+    global _log_setup
+    
+    # Set log level from config
+    log_level = getattr(logging, app.config.get('LOG_LEVEL', 'DEBUG'))
+    app.logger.setLevel(log_level)
+    
+    # Flask's stderr handler would duplicate the console handler, and
+    # propagating to the root logger could emit every record twice
+    app.logger.removeHandler(default_handler)
+    app.logger.propagate = False
+    
+    # The 'app' logger is shared by every app instance; reuse the
+    # handlers when the settings match so repeated create_app() calls
+    # do not stack them, and replace them when the settings changed
+    settings = (log_level, bool(app.config.get('DEBUG')))
+    
+    if _log_setup is not None:
+        previous, queue_handler, listener = _log_setup
+        
+        if previous == settings and queue_handler in app.logger.handlers:
+            app.extensions['log_listener'] = listener
+            return
+        
+        app.logger.removeHandler(queue_handler)
+        atexit.unregister(listener.stop)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        _log_setup = None
+    
     # Create logs directory if it doesn't exist
     log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
     if not os.path.exists(log_dir):
@@ -74,11 +128,14 @@ def setup_logging(app):
     
     log_file = os.path.join(log_dir, 'app.log')
     
-    # Create file handler with rotation
-    file_handler = RotatingFileHandler(
+    # Create buffered file handler with rotation
+    # (flushes every 30s, at 64KB pending, or immediately on ERROR)
+    file_handler = BufferedRotatingFileHandler(
         log_file,
         maxBytes=10240000,  # 10MB
-        backupCount=5
+        backupCount=5,
+        flush_interval=30,
+        flush_bytes=65536
     )
     
     # Set log format
@@ -86,26 +143,58 @@ def setup_logging(app):
         '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
     )
     file_handler.setFormatter(log_format)
-    
-    # Set log level from config
-    log_level = getattr(logging, app.config.get('LOG_LEVEL', 'DEBUG'))
     file_handler.setLevel(log_level)
     
-    # Add handler to app logger
-    app.logger.addHandler(file_handler)
-    app.logger.setLevel(log_level)
+    handlers = [file_handler]
     
     # Also log to console in development
     if app.config.get('DEBUG'):
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(log_format)
         console_handler.setLevel(log_level)
-        app.logger.addHandler(console_handler)
+        handlers.append(console_handler)
+    
+    # Route app logger through a queue drained by a background thread
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setLevel(log_level)
+    
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    app.extensions['log_listener'] = listener
+    
+    app.logger.addHandler(queue_handler)
+    _log_setup = (settings, queue_handler, listener)
+
+
+# Static error bodies, serialized once at import
+ERROR_401 = orjson.dumps({
+    'success': False,
+    'error': 'Unauthorized',
+    'message': 'Authentication required'
+})
+ERROR_403 = orjson.dumps({
+    'success': False,
+    'error': 'Forbidden',
+    'message': 'You do not have permission to access this resource'
+})
+ERROR_404 = orjson.dumps({
+    'success': False,
+    'error': 'Not Found',
+    'message': 'The requested resource was not found'
+})
+ERROR_500 = orjson.dumps({
+    'success': False,
+    'error': 'Internal Server Error',
+    'message': 'An unexpected error occurred'
+})
 
 
 def register_error_handlers(app):
     """
     Register global error handlers
+    Static error bodies are pre-serialized; 400 keeps its dynamic message
     """
     @app.errorhandler(400)
     def bad_request(error):
@@ -119,35 +208,19 @@ def register_error_handlers(app):
     @app.errorhandler(401)
     def unauthorized(error):
         app.logger.warning(f'Unauthorized access attempt: {error}')
-        return jsonify({
-            'success': False,
-            'error': 'Unauthorized',
-            'message': 'Authentication required'
-        }), 401
+        return app.response_class(ERROR_401, status=401, mimetype='application/json')
     
     @app.errorhandler(403)
     def forbidden(error):
         app.logger.warning(f'Forbidden access: {error}')
-        return jsonify({
-            'success': False,
-            'error': 'Forbidden',
-            'message': 'You do not have permission to access this resource'
-        }), 403
+        return app.response_class(ERROR_403, status=403, mimetype='application/json')
     
     @app.errorhandler(404)
     def not_found(error):
         app.logger.info(f'Resource not found: {error}')
-        return jsonify({
-            'success': False,
-            'error': 'Not Found',
-            'message': 'The requested resource was not found'
-        }), 404
+        return app.response_class(ERROR_404, status=404, mimetype='application/json')
     
     @app.errorhandler(500)
     def internal_error(error):
         app.logger.error(f'Internal server error: {error}')
-        return jsonify({
-            'success': False,
-            'error': 'Internal Server Error',
-            'message': 'An unexpected error occurred'
-        }), 500
\ No newline at end of file
+        return app.response_class(ERROR_500, status=500, mimetype='application/json')
\ No newline at end of file
@@ -24,6 +24,11 @@ class Config:
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'default-jwt-secret')
     JWT_EXPIRY_HOURS = int(os.getenv('JWT_EXPIRY_HOURS', 24))
     
+    # Password hashing (argon2id)
+    ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 2))
+    ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 65536))
+    ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 1))
+    
     # Database type (mysql or postgresql)
     DB_TYPE = os.getenv('DB_TYPE', 'mysql').lower()
     
@@ -41,6 +46,21 @@ class Config:
     POSTGRES_PASSWORD = os.getenv('POSTGRES_PASSWORD', '')
     POSTGRES_DATABASE = os.getenv('POSTGRES_DATABASE', 'task_management')
     
+    # Connection pool sizing
+    # Suggested starting point: 2 * number of worker threads
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 20))
+    DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', DB_POOL_SIZE))
+    # psycopg2 closes returned connections above DB_POOL_MIN (losing their
+    # prepared statements), so keep the whole pool open by default
+    DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', DB_POOL_MAX))
+    
+    # Connection pool warm-up (PostgreSQL; open connections at startup)
+    PREWARM_POOL = os.getenv('PREWARM_POOL', 'True').lower() == 'true'
+    PREWARM_SIZE = int(os.getenv('PREWARM_SIZE', 10))
+    
+    # Redis for the shared token cache and logout revocations (optional)
+    REDIS_URL = os.getenv('REDIS_URL', '')
+    
     # Logging settings
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
     
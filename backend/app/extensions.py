@@ -3,22 +3,43 @@ Database Connection Extensions
 Handles MySQL and PostgreSQL connections
 """
 
+import hashlib
+import itertools
+import logging
+import time
+import weakref
+
 from mysql.connector import pooling
-from flask import g, current_app
+from flask import g
 
 # Database connection pool
 db_pool = None
 
+# Bound once in init_db so the query path avoids current_app lookups
+db_type = 'mysql'
+logger = logging.getLogger('app')
+
+# Log connection checkouts slower than this (pool pressure)
+SLOW_ACQUIRE_MS = 50
+
+# PostgreSQL server-side prepared statements, tracked per connection
+# and keyed by query text
+_prepared = weakref.WeakKeyDictionary()
+
+# Unique names for PostgreSQL server-side (named) cursors
+_stream_ids = itertools.count()
+
 
 def init_db(app):
     """
     Initialize database connection pool
     Called during app startup
     """
-    global db_pool
+    global db_pool, db_type, logger
     
     config = app.config
     db_type = config.get('DB_TYPE', 'mysql')
+    logger = app.logger
     
     try:
         if db_type == 'postgresql':
@@ -26,29 +47,48 @@ def init_db(app):
             import psycopg2
             from psycopg2 import pool
             
+            pool_size = config.get('DB_POOL_MAX', 20)
+            min_size = min(config.get('DB_POOL_MIN', pool_size), pool_size)
+            
+            # Warm-up: the constructor opens minconn connections up front,
+            # and putconn only keeps up to minconn of them idle, so the
+            # warm-up size is folded into minconn
+            if config.get('PREWARM_POOL', True):
+                min_size = max(min_size, min(config.get('PREWARM_SIZE', pool_size), pool_size))
+            
             db_pool = pool.ThreadedConnectionPool(
-                minconn=1,
-                maxconn=10,
+                minconn=min_size,
+                maxconn=pool_size,
                 host=config.get('POSTGRES_HOST'),
                 port=config.get('POSTGRES_PORT'),
                 user=config.get('POSTGRES_USER'),
                 password=config.get('POSTGRES_PASSWORD'),
                 database=config.get('POSTGRES_DATABASE')
             )
-            app.logger.info('PostgreSQL connection pool created')
+            app.logger.info(
+                f'PostgreSQL connection pool created ({min_size} open, max {pool_size})'
+            )
         else:
-            # MySQL connection pool
+            # MySQL connection pool; the constructor already opens all
+            # pool_size connections, so there is nothing to warm up
+            pool_size = config.get('DB_POOL_SIZE', 20)
+            # No session reset on checkout: the app only runs parametrized
+            # queries and keeps no session state (user variables, temp
+            # tables), so COM_RESET_CONNECTION would be a wasted round trip.
+            # Autocommit keeps reads from leaving a transaction open, so
+            # close_db has nothing to roll back on the common path.
             db_pool = pooling.MySQLConnectionPool(
                 pool_name="app_pool",
-                pool_size=10,
-                pool_reset_session=True,
+                pool_size=pool_size,
+                pool_reset_session=False,
+                autocommit=True,
                 host=config.get('MYSQL_HOST'),
                 port=config.get('MYSQL_PORT'),
                 user=config.get('MYSQL_USER'),
                 password=config.get('MYSQL_PASSWORD'),
                 database=config.get('MYSQL_DATABASE')
             )
-            app.logger.info('MySQL connection pool created')
+            app.logger.info(f'MySQL connection pool created (size {pool_size})')
             
     except Exception as e:
         app.logger.error(f'Failed to create database pool: {e}')
@@ -61,18 +101,28 @@ def get_db():
     Connection is stored in Flask's g object for request lifecycle
     """
     if 'db' not in g:
-        config = current_app.config
-        db_type = config.get('DB_TYPE', 'mysql')
-        
         try:
+            started = time.perf_counter()
+            
             if db_type == 'postgresql':
                 g.db = db_pool.getconn()
+                # Client-side flag, no round trip: reads then run outside
+                # a transaction and putconn has nothing to roll back
+                if not g.db.autocommit:
+                    g.db.autocommit = True
             else:
                 g.db = db_pool.get_connection()
-                
-            current_app.logger.debug('Database connection acquired')
+            
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if elapsed_ms > SLOW_ACQUIRE_MS:
+                logger.warning(
+                    'Slow database connection acquire: %.1fms', elapsed_ms
+                )
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Database connection acquired')
         except Exception as e:
-            current_app.logger.error(f'Failed to get database connection: {e}')
+            logger.error(f'Failed to get database connection: {e}')
             raise
             
     return g.db
@@ -85,21 +135,78 @@ def close_db(error=None):
     db = g.pop('db', None)
     
     if db is not None:
-        config = current_app.config
-        db_type = config.get('DB_TYPE', 'mysql')
-        
         try:
             if db_type == 'postgresql':
                 db_pool.putconn(db)
             else:
+                # Sessions are not reset by the pool, so do not hand over
+                # an open transaction (and its stale snapshot). Connections
+                # autocommit, so this only happens after a failed batch.
+                if db.in_transaction:
+                    db.rollback()
                 db.close()
                 
-            current_app.logger.debug('Database connection returned to pool')
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Database connection returned to pool')
         except Exception as e:
-            current_app.logger.error(f'Error closing database connection: {e}')
+            logger.error(f'Error closing database connection: {e}')
 
 
-def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=False):
+def _begin(db):
+    """
+    Open an explicit transaction on an autocommit connection
+    """
+    if db_type == 'postgresql':
+        db.autocommit = False
+    else:
+        db.start_transaction()
+
+
+def _end(db, commit=True):
+    """
+    Commit or roll back a transaction opened by _begin and return the
+    connection to autocommit
+    """
+    if commit:
+        db.commit()
+    else:
+        db.rollback()
+    
+    if db_type == 'postgresql':
+        db.autocommit = True
+
+
+def _postgres_prepared_query(db, cursor, query):
+    """
+    Get the EXECUTE statement for a PostgreSQL query
+    
+    Issues PREPARE once per connection and returns the matching
+    EXECUTE statement to run with the original parameters.
+    """
+    statements = _prepared.setdefault(db, {})
+    statement = statements.get(query)
+    
+    if statement is None:
+        name = 'stmt_' + hashlib.md5(query.encode('utf-8')).hexdigest()[:16]
+        
+        # Rewrite %s placeholders as $1, $2, ...
+        parts = query.split('%s')
+        numbered = parts[0] + ''.join(
+            f'${i}{part}' for i, part in enumerate(parts[1:], start=1)
+        )
+        cursor.execute(f'PREPARE {name} AS {numbered}')
+        
+        if len(parts) > 1:
+            statement = f'EXECUTE {name} ({", ".join(["%s"] * (len(parts) - 1))})'
+        else:
+            statement = f'EXECUTE {name}'
+        statements[query] = statement
+        
+    return statement
+
+
+def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=False,
+                  prepared=False, row_format='dict'):
     """
     Execute a database query with proper error handling
     
@@ -108,26 +215,37 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=F
         params: Query parameters (tuple or dict)
         fetch_one: Return single row
         fetch_all: Return all rows
-        commit: Commit transaction
+        commit: Write statement; return the last row id (connections
+            autocommit, so the statement is committed on its own)
+        prepared: Use a server-side prepared statement cached
+            per connection (read queries only; PostgreSQL only, since
+            mysql-connector's prepared cursor resets the statement
+            before every execute, costing an extra round trip)
+        row_format: 'dict' for dict rows, 'tuple' for plain tuples
+            returned together with the column names
         
     Returns:
         Query results or last row id for INSERT
+        In tuple format, fetches return (columns, rows) or (columns, row)
     """
     db = get_db()
     cursor = None
     
-    config = current_app.config
-    db_type = config.get('DB_TYPE', 'mysql')
-    
     try:
         if db_type == 'postgresql':
-            from psycopg2.extras import RealDictCursor
-            cursor = db.cursor(cursor_factory=RealDictCursor)
+            if row_format == 'dict':
+                from psycopg2.extras import RealDictCursor
+                cursor = db.cursor(cursor_factory=RealDictCursor)
+            else:
+                cursor = db.cursor()
+            if prepared:
+                query = _postgres_prepared_query(db, cursor, query)
         else:
-            cursor = db.cursor(dictionary=True)
+            cursor = db.cursor(dictionary=(row_format == 'dict'))
         
-        # Log query for debugging (sanitized)
-        current_app.logger.debug(f'Executing query: {query[:100]}...')
+        # Log query for debugging (sanitized), skipped unless DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Executing query: %s...', query[:100])
         
         cursor.execute(query, params)
         
@@ -138,17 +256,176 @@ def execute_query(query, params=None, fetch_one=False, fetch_all=False, commit=F
         elif fetch_all:
             result = cursor.fetchall()
         elif commit:
-            db.commit()
             result = cursor.lastrowid
+        
+        if row_format == 'tuple' and (fetch_one or fetch_all):
+            columns = tuple(column[0] for column in cursor.description)
+            result = (columns, result)
             
         return result
         
     except Exception as e:
-        current_app.logger.error(f'Database query error: {e}')
-        if commit:
-            db.rollback()
+        logger.error(f'Database query error: {e}')
+        raise
+        
+    finally:
+        if cursor:
+            cursor.close()
+
+def stream_query(query, params=None, itersize=1000):
+    """
+    Iterate over a SELECT without loading the whole result into memory
+    
+    PostgreSQL uses a named (server-side) cursor fetched itersize rows
+    at a time; MySQL reads rows off an unbuffered cursor. The query is
+    executed and its first batch fetched before this returns, so SQL
+    and connection errors raise here, inside the route, rather than
+    after a streamed response has started. The connection stays checked
+    out until the iterator is exhausted or closed, so wrap responses in
+    stream_with_context.
+    
+    Args:
+        query: SQL query string
+        params: Query parameters (tuple or dict)
+        itersize: Rows per network fetch
+        
+    Returns:
+        Iterator of row dicts
+    """
+    rows = _stream_rows(query, params, itersize)
+    
+    # Run up to the priming yield; a started generator also always
+    # reaches its cleanup when closed, even if never iterated
+    next(rows)
+    
+    return rows
+
+
+def _stream_rows(query, params, itersize):
+    """
+    Generator behind stream_query; yields None once the query has run
+    and its first batch is fetched, then the rows
+    """
+    db = get_db()
+    cursor = None
+    
+    try:
+        if db_type == 'postgresql':
+            from psycopg2.extras import RealDictCursor
+            # Named cursors only live inside a transaction
+            _begin(db)
+            cursor = db.cursor(
+                name=f'stream_{next(_stream_ids)}',
+                cursor_factory=RealDictCursor
+            )
+            cursor.itersize = itersize
+        else:
+            cursor = db.cursor(dictionary=True)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Streaming query: %s...', query[:100])
+        
+        cursor.execute(query, params)
+        first_batch = cursor.fetchmany(itersize)
+        
+        yield None
+        
+        yield from first_batch
+        yield from cursor
+        
+    except GeneratorExit:
+        # Consumer stopped early; MySQL won't reuse the connection
+        # until the rest of the result has been read
+        if db_type != 'postgresql':
+            cursor.fetchall()
+        raise
+        
+    except Exception as e:
+        logger.error(f'Database stream error: {e}')
+        raise
+        
+    finally:
+        if cursor:
+            cursor.close()
+        if db_type == 'postgresql':
+            _end(db, commit=False)
+
+
+def execute_many(queries):
+    """
+    Execute several statements on one cursor in a single transaction
+    
+    The transaction is committed once after the last statement, or
+    rolled back if any statement fails; either way the connection is
+    back in autocommit when this returns.
+    
+    Args:
+        queries: List of (query, params) tuples
+        
+    Returns:
+        List of affected row counts, one per statement
+    """
+    db = get_db()
+    cursor = None
+    
+    try:
+        cursor = db.cursor()
+        rowcounts = []
+        _begin(db)
+        
+        for query, params in queries:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Executing query: %s...', query[:100])
+            
+            cursor.execute(query, params)
+            rowcounts.append(cursor.rowcount)
+        
+        _end(db)
+            
+        return rowcounts
+        
+    except Exception as e:
+        logger.error(f'Database batch error: {e}')
+        _end(db, commit=False)
+        raise
+        
+    finally:
+        if cursor:
+            cursor.close()
+
+
+def execute_pipeline(queries):
+    """
+    Send several statements to the server in a single round trip
+    
+    PostgreSQL: the statements are bound client-side and sent as one
+    multi-statement query, which the server runs as a single implicit
+    transaction. MySQL: falls back to execute_many.
+    
+    Args:
+        queries: List of (query, params) tuples
+    """
+    if db_type != 'postgresql':
+        execute_many(queries)
+        return
+    
+    db = get_db()
+    cursor = None
+    
+    try:
+        cursor = db.cursor()
+        
+        batch = b';\n'.join(cursor.mogrify(query, params) for query, params in queries)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Executing pipeline of %d statements', len(queries))
+        
+        cursor.execute(batch)
+        
+    except Exception as e:
+        logger.error(f'Database pipeline error: {e}')
         raise
         
     finally:
         if cursor:
-            cursor.close()
\ No newline at end of file
+            cursor.close()
@@ -3,35 +3,145 @@ Authentication Middleware
 JWT token generation and verification
 """
 
+import base64
+import binascii
+import hashlib
+import hmac
 import jwt
-from datetime import datetime, timedelta
+import orjson
+import secrets
+import time
 from functools import wraps
 from flask import request, current_app
 from app.utils.responses import error_response
+from app.utils.token_cache import is_revoked, validate_cached
 
+# JWT settings, bound once by init_auth()
+_SECRET = None
+_ALG = 'HS256'
+_EXP_SECONDS = 24 * 3600
 
-def generate_token(user_id, role):
+# HMAC-SHA256 keyed with the secret; copied per token so the key
+# pads are only derived once
+_HMAC = None
+
+# Base64url of {"alg":"HS256","typ":"JWT"}, identical for every token
+_HEADER_SEGMENT = base64.urlsafe_b64encode(
+    orjson.dumps({'alg': _ALG, 'typ': 'JWT'})
+).rstrip(b'=')
+
+
+def init_auth(app):
+    """
+    Bind JWT settings from app config
+    Called during app startup
+    """
+    global _SECRET, _EXP_SECONDS, _HMAC
+    
+    _SECRET = app.config.get('JWT_SECRET_KEY').encode('utf-8')
+    _EXP_SECONDS = int(app.config.get('JWT_EXPIRY_HOURS', 24)) * 3600
+    _HMAC = hmac.new(_SECRET, digestmod=hashlib.sha256)
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _b64decode(segment):
+    return base64.urlsafe_b64decode(segment + b'=' * (-len(segment) % 4))
+
+
+def _sign(signing_input):
+    mac = _HMAC.copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+
+def _encode(payload):
+    """
+    Encode and sign an HS256 JWT
+    """
+    signing_input = _HEADER_SEGMENT + b'.' + _b64encode(orjson.dumps(payload))
+    
+    return (signing_input + b'.' + _b64encode(_sign(signing_input))).decode('ascii')
+
+
+def _decode(token):
+    """
+    Verify an HS256 JWT and return its payload
+    
+    Raises the matching jwt.InvalidTokenError subclass on failure
+    """
+    try:
+        signing_input, signature_segment = token.encode('ascii').rsplit(b'.', 1)
+        header_segment, payload_segment = signing_input.split(b'.', 1)
+        header = orjson.loads(_b64decode(header_segment))
+        signature = _b64decode(signature_segment)
+    except (ValueError, binascii.Error) as e:
+        raise jwt.DecodeError('Invalid token format') from e
+    
+    if not isinstance(header, dict) or header.get('alg') != _ALG:
+        raise jwt.InvalidAlgorithmError('The specified alg value is not allowed')
+    
+    if not hmac.compare_digest(_sign(signing_input), signature):
+        raise jwt.InvalidSignatureError('Signature verification failed')
+    
+    try:
+        payload = orjson.loads(_b64decode(payload_segment))
+    except (ValueError, binascii.Error) as e:
+        raise jwt.DecodeError('Invalid payload') from e
+    
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError('Invalid payload')
+    
+    exp = payload.get('exp')
+    if exp is None:
+        raise jwt.MissingRequiredClaimError('exp')
+    if isinstance(exp, bool) or not isinstance(exp, (int, float)):
+        raise jwt.DecodeError('Expiration Time claim (exp) must be an integer')
+    if exp <= time.time():
+        raise jwt.ExpiredSignatureError('Signature has expired')
+    
+    return payload
+
+
+def generate_token(user_id, role, email=None, name=None, created_at=None):
     """
     Generate JWT token for authenticated user
     
+    Profile claims (email, name, created_at) let /me answer without a
+    database query; they can be stale for at most the token lifetime.
+    
     Args:
         user_id: User's database ID
         role: User's role (user/admin)
+        email: User's email address (optional claim)
+        name: User's full name (optional claim)
+        created_at: Account creation datetime (optional claim)
     
     Returns:
         JWT token string
     """
-    secret_key = current_app.config.get('JWT_SECRET_KEY')
-    expiry_hours = current_app.config.get('JWT_EXPIRY_HOURS', 24)
+    # Integer epoch seconds, as stored in the token anyway
+    now = int(time.time())
     
     payload = {
         'user_id': user_id,
         'role': role,
-        'iat': datetime.utcnow(),
-        'exp': datetime.utcnow() + timedelta(hours=expiry_hours)
+        'iat': now,
+        'exp': now + _EXP_SECONDS,
+        # Unique token ID, used to revoke the token on logout
+        'jti': secrets.token_hex(16)
     }
     
-    token = jwt.encode(payload, secret_key, algorithm='HS256')
+    if email is not None:
+        payload['email'] = email
+    if name is not None:
+        payload['name'] = name
+    if created_at is not None:
+        payload['created_at'] = created_at.isoformat()
+    
+    token = _encode(payload)
     
     return token
 
@@ -46,16 +156,15 @@ def decode_token(token):
     Returns:
         Decoded payload or None if invalid
     """
-    secret_key = current_app.config.get('JWT_SECRET_KEY')
-    
     try:
-        payload = jwt.decode(token, secret_key, algorithms=['HS256'])
-        return payload
+        # Verified payloads are cached by token; any tampering changes
+        # the signature and therefore the key
+        return validate_cached(token, _decode)
     except jwt.ExpiredSignatureError:
         current_app.logger.warning('Token expired')
         return None
     except jwt.InvalidTokenError as e:
-        current_app.logger.warning(f'Invalid token: {e}')
+        current_app.logger.warning('Invalid token: %s', e)
         return None
 
 
@@ -68,7 +177,8 @@ def token_required(f):
         @app.route('/protected')
         @token_required
         def protected_route(current_user):
-            # current_user contains user_id and role
+            # current_user contains user_id, role, jti, exp and
+            # the email/name/created_at profile claims
             pass
     """
     @wraps(f)
@@ -78,11 +188,9 @@ def token_required(f):
         # Get token from Authorization header
         auth_header = request.headers.get('Authorization')
         
-        if auth_header:
-            # Expected format: "Bearer <token>"
-            parts = auth_header.split()
-            if len(parts) == 2 and parts[0].lower() == 'bearer':
-                token = parts[1]
+        # Expected format: "Bearer <token>"
+        if auth_header and auth_header[:7].lower() == 'bearer ':
+            token = auth_header[7:].strip()
         
         if not token:
             current_app.logger.warning('Request without token')
@@ -94,10 +202,18 @@ def token_required(f):
         if not payload:
             return error_response('Invalid or expired token', 401)
         
+        if is_revoked(payload.get('jti')):
+            return error_response('Token has been revoked', 401)
+        
         # Create current_user dict from payload
         current_user = {
             'user_id': payload.get('user_id'),
-            'role': payload.get('role')
+            'role': payload.get('role'),
+            'jti': payload.get('jti'),
+            'exp': payload.get('exp'),
+            'email': payload.get('email'),
+            'name': payload.get('name'),
+            'created_at': payload.get('created_at')
         }
         
         # Pass current_user to the wrapped function
@@ -3,6 +3,7 @@ Role-based Access Control Middleware
 Checks user roles for protected routes
 """
 
+import logging
 from functools import wraps
 from flask import current_app
 from app.utils.responses import error_response
@@ -22,11 +23,13 @@ def admin_required(f):
     """
     @wraps(f)
     def decorated(current_user, *args, **kwargs):
-        if current_user.get('role') != 'admin':
-            current_app.logger.warning(
-                f'Non-admin user {current_user.get("user_id")} '
-                f'attempted to access admin route'
-            )
+        # current_user always comes from @token_required
+        if current_user['role'] != 'admin':
+            if current_app.logger.isEnabledFor(logging.WARNING):
+                current_app.logger.warning(
+                    'Non-admin user %s attempted to access admin route',
+                    current_user['user_id']
+                )
             return error_response(
                 'Admin privileges required for this action', 
                 403
@@ -49,20 +52,22 @@ def role_required(*allowed_roles):
         def special_route(current_user):
             pass
     """
+    # Built once per decorated route
+    allowed = frozenset(allowed_roles)
+    denied_message = f'Required role: {", ".join(allowed_roles)}'
+    
     def decorator(f):
         @wraps(f)
         def decorated(current_user, *args, **kwargs):
-            user_role = current_user.get('role')
+            user_role = current_user['role']
             
-            if user_role not in allowed_roles:
-                current_app.logger.warning(
-                    f'User {current_user.get("user_id")} with role {user_role} '
-                    f'denied access to route requiring {allowed_roles}'
-                )
-                return error_response(
-                    f'Required role: {", ".join(allowed_roles)}',
-                    403
-                )
+            if user_role not in allowed:
+                if current_app.logger.isEnabledFor(logging.WARNING):
+                    current_app.logger.warning(
+                        'User %s with role %s denied access to route requiring %s',
+                        current_user['user_id'], user_role, allowed_roles
+                    )
+                return error_response(denied_message, 403)
             
             return f(current_user, *args, **kwargs)
         
@@ -3,9 +3,57 @@ Task Model
 Database operations for tasks table
 """
 
-from app.extensions import execute_query
+from app.extensions import execute_query, stream_query
 from flask import current_app
 
+# SELECT list and FROM clause for the all-tasks listings, keyed by
+# include_user; the join carries the owner's name so a listing needs
+# no per-task user lookups
+_ALL_TASKS_SOURCES = {
+    False: (
+        "t.id, t.title, t.description, t.status, t.user_id, t.created_at",
+        "tasks t"
+    ),
+    True: (
+        "t.id, t.title, t.description, t.status, t.user_id, t.created_at, "
+        "u.name AS user_name",
+        "tasks t LEFT JOIN users u ON u.id = t.user_id"
+    )
+}
+
+_ALL_TASKS_QUERY = """
+    SELECT {select}
+    FROM {source}
+    WHERE t.status = COALESCE(%s, t.status)
+      AND t.user_id = COALESCE(%s, t.user_id){seek}
+    ORDER BY t.created_at DESC, t.id DESC
+    {page}
+"""
+
+# All-tasks listing queries keyed by (include_user, keyset), built
+# once at import so every call sends the same statement text
+_FIND_ALL_QUERIES = {
+    (include_user, keyset): _ALL_TASKS_QUERY.format(
+        select=select,
+        source=source,
+        seek="\n      AND (t.created_at, t.id) < (%s, %s)" if keyset else "",
+        page="LIMIT %s" if keyset else "LIMIT %s OFFSET %s"
+    )
+    for include_user, (select, source) in _ALL_TASKS_SOURCES.items()
+    for keyset in (False, True)
+}
+
+# Offset pages with the total as a window count, keyed by include_user
+_FIND_ALL_WITH_TOTAL_QUERIES = {
+    include_user: _ALL_TASKS_QUERY.format(
+        select=f"{select},\n           COUNT(*) OVER () AS total",
+        source=source,
+        seek="",
+        page="LIMIT %s OFFSET %s"
+    )
+    for include_user, (select, source) in _ALL_TASKS_SOURCES.items()
+}
+
 
 class TaskModel:
     """
@@ -55,88 +103,211 @@ class TaskModel:
         """
         params = (task_id,)
         
-        task = execute_query(query, params, fetch_one=True)
+        task = execute_query(query, params, fetch_one=True, prepared=True)
         
         return task
     
     @staticmethod
-    def find_by_user(user_id, status=None, limit=10, offset=0):
+    def find_by_user(user_id, status=None, limit=10, offset=0,
+                     after_created_at=None, after_id=None):
         """
         Find all tasks belonging to a user
         
+        Pass after_created_at/after_id (the last row of the previous
+        page) for keyset pagination; offset is ignored in that case.
+        
         Args:
             user_id: Owner's user ID
             status: Filter by status (optional)
             limit: Max results
             offset: Pagination offset
+            after_created_at: Keyset cursor timestamp (optional)
+            after_id: Keyset cursor task ID (optional)
         
         Returns:
-            List of task dicts
+            Tuple of (column names, list of task row tuples)
         """
-        if status:
+        # Single statement per mode so one prepared plan is reused
+        if after_created_at is not None:
             query = """
                 SELECT id, title, description, status, user_id, created_at
                 FROM tasks
-                WHERE user_id = %s AND status = %s
-                ORDER BY created_at DESC
-                LIMIT %s OFFSET %s
+                WHERE user_id = %s AND status = COALESCE(%s, status)
+                  AND (created_at, id) < (%s, %s)
+                ORDER BY created_at DESC, id DESC
+                LIMIT %s
             """
-            params = (user_id, status, limit, offset)
+            params = (user_id, status or None, after_created_at, after_id, limit)
         else:
             query = """
                 SELECT id, title, description, status, user_id, created_at
                 FROM tasks
-                WHERE user_id = %s
-                ORDER BY created_at DESC
+                WHERE user_id = %s AND status = COALESCE(%s, status)
+                ORDER BY created_at DESC, id DESC
                 LIMIT %s OFFSET %s
             """
-            params = (user_id, limit, offset)
+            params = (user_id, status or None, limit, offset)
+        
+        columns, rows = execute_query(
+            query, params, fetch_all=True, prepared=True, row_format='tuple'
+        )
+        
+        return columns, rows or []
+    
+    @staticmethod
+    def find_by_user_with_total(user_id, status=None, limit=10, offset=0,
+                                after_created_at=None, after_id=None):
+        """
+        Find a page of a user's tasks together with the total count
+        Uses COUNT(*) OVER () so rows and total come from one query;
+        keyset pages run the seek query and a separate count instead
+        
+        Args:
+            user_id: Owner's user ID
+            status: Filter by status (optional)
+            limit: Max results
+            offset: Pagination offset
+            after_created_at: Keyset cursor timestamp (optional)
+            after_id: Keyset cursor task ID (optional)
         
-        tasks = execute_query(query, params, fetch_all=True)
+        Returns:
+            Tuple of (column names, list of task row tuples, total count)
+        """
+        if after_created_at is not None:
+            # The window count would have to scan every matching row
+            # before the cursor filter, so the page could not seek on
+            # the index; run the seek query and count separately
+            columns, rows = TaskModel.find_by_user(
+                user_id, status, limit,
+                after_created_at=after_created_at, after_id=after_id
+            )
+            return columns, rows, TaskModel.count_by_user(user_id, status)
+        
+        query = """
+            SELECT id, title, description, status, user_id, created_at,
+                   COUNT(*) OVER () AS total
+            FROM tasks
+            WHERE user_id = %s AND status = COALESCE(%s, status)
+            ORDER BY created_at DESC, id DESC
+            LIMIT %s OFFSET %s
+        """
+        params = (user_id, status or None, limit, offset)
+        
+        columns, rows = execute_query(
+            query, params, fetch_all=True, prepared=True, row_format='tuple'
+        )
+        
+        if not rows:
+            # Past the last page there is no row to carry the total
+            if offset:
+                return columns[:-1], [], TaskModel.count_by_user(user_id, status)
+            return columns[:-1], [], 0
         
-        return tasks if tasks else []
+        total = rows[0][-1]
+        
+        return columns[:-1], [row[:-1] for row in rows], total
     
     @staticmethod
-    def find_all(status=None, user_id=None, limit=100, offset=0):
+    def find_all(status=None, user_id=None, limit=100, offset=0,
+                 after_created_at=None, after_id=None, include_user=False):
         """
         Find all tasks with optional filters
         
+        Pass after_created_at/after_id (the last row of the previous
+        page) for keyset pagination; offset is ignored in that case.
+        
         Args:
             status: Filter by status (optional)
             user_id: Filter by user (optional)
             limit: Max results
             offset: Pagination offset
+            after_created_at: Keyset cursor timestamp (optional)
+            after_id: Keyset cursor task ID (optional)
+            include_user: Add the owner's name as user_name
         
         Returns:
-            List of task dicts
+            Tuple of (column names, list of task row tuples)
         """
-        conditions = []
-        params = []
+        keyset = after_created_at is not None
+        query = _FIND_ALL_QUERIES[include_user, keyset]
         
-        if status:
-            conditions.append("status = %s")
-            params.append(status)
+        if keyset:
+            params = (status or None, user_id or None, after_created_at, after_id, limit)
+        else:
+            params = (status or None, user_id or None, limit, offset)
         
-        if user_id:
-            conditions.append("user_id = %s")
-            params.append(user_id)
+        columns, rows = execute_query(
+            query, params, fetch_all=True, prepared=True, row_format='tuple'
+        )
         
-        where_clause = ""
-        if conditions:
-            where_clause = "WHERE " + " AND ".join(conditions)
+        return columns, rows or []
+    
+    @staticmethod
+    def find_all_with_total(status=None, user_id=None, limit=100, offset=0,
+                            after_created_at=None, after_id=None, include_user=False):
+        """
+        Find a page of all tasks together with the total count
+        Uses COUNT(*) OVER () so rows and total come from one query;
+        keyset pages run the seek query and a separate count instead
         
-        query = f"""
-            SELECT id, title, description, status, user_id, created_at
-            FROM tasks
-            {where_clause}
-            ORDER BY created_at DESC
-            LIMIT %s OFFSET %s
+        Args:
+            status: Filter by status (optional)
+            user_id: Filter by user (optional)
+            limit: Max results
+            offset: Pagination offset
+            after_created_at: Keyset cursor timestamp (optional)
+            after_id: Keyset cursor task ID (optional)
+            include_user: Add the owner's name as user_name
+        
+        Returns:
+            Tuple of (column names, list of task row tuples, total count)
         """
-        params.extend([limit, offset])
+        if after_created_at is not None:
+            # See find_by_user_with_total: keep the keyset page a seek
+            columns, rows = TaskModel.find_all(
+                status, user_id, limit,
+                after_created_at=after_created_at, after_id=after_id,
+                include_user=include_user
+            )
+            return columns, rows, TaskModel.count_all(status, user_id)
+        
+        query = _FIND_ALL_WITH_TOTAL_QUERIES[include_user]
+        params = (status or None, user_id or None, limit, offset)
+        
+        columns, rows = execute_query(
+            query, params, fetch_all=True, prepared=True, row_format='tuple'
+        )
+        
+        if not rows:
+            # Past the last page there is no row to carry the total
+            if offset:
+                return columns[:-1], [], TaskModel.count_all(status, user_id)
+            return columns[:-1], [], 0
+        
+        total = rows[0][-1]
+        
+        return columns[:-1], [row[:-1] for row in rows], total
+    
+    @staticmethod
+    def iter_all(status=None, user_id=None, limit=100, offset=0, include_user=False):
+        """
+        Stream one page of all tasks with optional filters
+        Rows are read from a server-side cursor instead of a list
+        
+        Args:
+            status: Filter by status (optional)
+            user_id: Filter by user (optional)
+            limit: Max results
+            offset: Pagination offset
+            include_user: Add the owner's name as user_name
         
-        tasks = execute_query(query, tuple(params), fetch_all=True)
+        Returns:
+            Generator of task dicts
+        """
+        query = _FIND_ALL_QUERIES[include_user, False]
+        params = (status or None, user_id or None, limit, offset)
         
-        return tasks if tasks else []
+        return stream_query(query, params)
     
     @staticmethod
     def count_by_user(user_id, status=None):
@@ -150,44 +321,38 @@ class TaskModel:
         Returns:
             Count of tasks
         """
-        if status:
-            query = """
-                SELECT COUNT(*) as count
-                FROM tasks
-                WHERE user_id = %s AND status = %s
-            """
-            params = (user_id, status)
-        else:
-            query = """
-                SELECT COUNT(*) as count
-                FROM tasks
-                WHERE user_id = %s
-            """
-            params = (user_id,)
+        query = """
+            SELECT COUNT(*) as count
+            FROM tasks
+            WHERE user_id = %s AND status = COALESCE(%s, status)
+        """
+        params = (user_id, status or None)
         
-        result = execute_query(query, params, fetch_one=True)
+        result = execute_query(query, params, fetch_one=True, prepared=True)
         
         return result['count'] if result else 0
     
     @staticmethod
-    def count_all(status=None):
+    def count_all(status=None, user_id=None):
         """
         Count all tasks
         
         Args:
             status: Filter by status (optional)
+            user_id: Filter by user (optional)
         
         Returns:
             Count of tasks
         """
-        if status:
-            query = "SELECT COUNT(*) as count FROM tasks WHERE status = %s"
-            params = (status,)
-        else:
-            query = "SELECT COUNT(*) as count FROM tasks"
-            params = None
+        query = """
+            SELECT COUNT(*) as count
+            FROM tasks
+            WHERE status = COALESCE(%s, status)
+              AND user_id = COALESCE(%s, user_id)
+        """
+        params = (status or None, user_id or None)
         
-        result = execute_query(query, params, fetch_one=True)
+        result = execute_query(query, params, fetch_one=True, prepared=True)
         
         return result['count'] if result else 0
     
@@ -3,9 +3,36 @@ User Model
 Database operations for users table
 """
 
-from app.extensions import execute_query
+import threading
+from cachetools import TTLCache
+from app.extensions import execute_pipeline, execute_query, stream_query
+from app.utils import user_cache
 from flask import current_app
 
+# Short-lived cache for email lookups, keyed by the normalized email
+# (see _email_key), which is also the value stored and queried, so
+# the key always matches the row it caches. Unknown emails are stored
+# as _MISSING so repeated failed logins for the same address don't
+# reach the database either.
+_MISSING = object()
+_email_cache = TTLCache(maxsize=50000, ttl=30)
+_email_cache_lock = threading.Lock()
+
+# User ID -> email cache key, so a user can be dropped by ID without
+# scanning the cache
+_email_keys = TTLCache(maxsize=50000, ttl=30)
+
+# Bumped on every invalidation; a lookup that raced with one is not
+# stored, so a stale row or "not found" can't outlive a create/update
+_email_cache_version = 0
+
+
+def _email_key(email):
+    """
+    Normalized form of an email address, as stored and looked up
+    """
+    return email.strip().lower()
+
 
 class UserModel:
     """
@@ -31,10 +58,13 @@ class UserModel:
             INSERT INTO users (email, password_hash, name, role)
             VALUES (%s, %s, %s, %s)
         """
-        params = (email, password_hash, name, role)
+        params = (_email_key(email), password_hash, name, role)
         
         user_id = execute_query(query, params, commit=True)
         
+        # Purge a cached "not found" for this address
+        UserModel.invalidate_email(email)
+        
         return user_id
     
     @staticmethod
@@ -55,10 +85,71 @@ class UserModel:
         """
         params = (email,)
         
-        user = execute_query(query, params, fetch_one=True)
+        user = execute_query(query, params, fetch_one=True, prepared=True)
         
         return user
     
+    @staticmethod
+    def find_by_email_cached(email):
+        """
+        Find user by email address, served from a 30s cache when possible
+        The email is normalized first; not-found results are cached as well
+        
+        Args:
+            email: User's email address
+        
+        Returns:
+            User dict or None
+        """
+        key = _email_key(email)
+        
+        with _email_cache_lock:
+            user = _email_cache.get(key)
+            version = _email_cache_version
+        
+        if user is None:
+            user = UserModel.find_by_email(key) or _MISSING
+            
+            with _email_cache_lock:
+                if version == _email_cache_version:
+                    _email_cache[key] = user
+                    if user is not _MISSING:
+                        _email_keys[user['id']] = key
+        
+        return None if user is _MISSING else user
+    
+    @staticmethod
+    def invalidate_email(email):
+        """
+        Drop an email from the lookup cache
+        
+        Args:
+            email: User's email address
+        """
+        global _email_cache_version
+        
+        with _email_cache_lock:
+            _email_cache_version += 1
+            _email_cache.pop(_email_key(email), None)
+    
+    @staticmethod
+    def _invalidate(user_id):
+        """
+        Drop a modified user from both the ID and email caches
+        
+        Args:
+            user_id: User's database ID
+        """
+        global _email_cache_version
+        
+        user_cache.invalidate(user_id)
+        
+        with _email_cache_lock:
+            _email_cache_version += 1
+            key = _email_keys.pop(user_id, None)
+            if key is not None:
+                _email_cache.pop(key, None)
+    
     @staticmethod
     def find_by_id(user_id):
         """
@@ -77,7 +168,7 @@ class UserModel:
         """
         params = (user_id,)
         
-        user = execute_query(query, params, fetch_one=True)
+        user = execute_query(query, params, fetch_one=True, prepared=True)
         
         return user
     
@@ -99,6 +190,23 @@ class UserModel:
         
         return users if users else []
     
+    @staticmethod
+    def iter_all():
+        """
+        Stream all users without their password hashes
+        Rows are read from a server-side cursor instead of a list
+        
+        Returns:
+            Generator of user dicts
+        """
+        query = """
+            SELECT id, email, name, role, created_at
+            FROM users
+            ORDER BY created_at DESC
+        """
+        
+        return stream_query(query)
+    
     @staticmethod
     def update(user_id, name=None, role=None):
         """
@@ -135,13 +243,15 @@ class UserModel:
         """
         
         execute_query(query, tuple(params), commit=True)
+        UserModel._invalidate(user_id)
         
         return True
     
     @staticmethod
     def delete(user_id):
         """
-        Delete a user
+        Delete a user and their tasks
+        Both deletes go out in one round trip and one transaction
         
         Args:
             user_id: User's database ID
@@ -149,10 +259,11 @@ class UserModel:
         Returns:
             True if deleted
         """
-        query = "DELETE FROM users WHERE id = %s"
-        params = (user_id,)
-        
-        execute_query(query, params, commit=True)
+        execute_pipeline([
+            ("DELETE FROM tasks WHERE user_id = %s", (user_id,)),
+            ("DELETE FROM users WHERE id = %s", (user_id,))
+        ])
+        UserModel._invalidate(user_id)
         
         return True
     
@@ -176,5 +287,6 @@ class UserModel:
         params = (password_hash, user_id)
         
         execute_query(query, params, commit=True)
+        UserModel._invalidate(user_id)
         
         return True
\ No newline at end of file
@@ -3,18 +3,29 @@ Authentication Routes
 Handles user registration, login, and token management
 """
 
-from flask import Blueprint, request, current_app
+from operator import itemgetter
+from flask import Blueprint, current_app
 from app.models.user_model import UserModel
-from app.utils.password import hash_password, verify_password
+from app.utils.password import hash_password, hash_password_async, verify_password, needs_rehash
 from app.utils.validators import validate_email, validate_password, sanitize_input
-from app.utils.responses import success_response, error_response
+from app.utils.responses import success_response, error_response, streamed_response, safe_route
+from app.utils.schemas import LoginReq, RegisterReq, parse_body
+from app.utils.token_cache import revoke
+from app.utils.user_cache import get_user_cached
 from app.middleware.auth_middleware import generate_token, token_required
 from app.middleware.role_check import admin_required
 
 auth_bp = Blueprint('auth', __name__)
 
+VALID_ROLES = frozenset({'user', 'admin'})
+
+# Public user fields (everything except the password hash)
+_USER_KEYS = ('id', 'email', 'name', 'role', 'created_at')
+_user_fields = itemgetter(*_USER_KEYS)
+
 
 @auth_bp.route('/register', methods=['POST'])
+@safe_route('Registration')
 def register():
     """
     Register a new user
@@ -30,67 +41,66 @@ def register():
         - 400: Validation error
         - 409: Email already exists
     """
-    try:
-        data = request.get_json()
-        
-        if not data:
-            current_app.logger.warning('Registration attempt with empty body')
-            return error_response('Request body is required', 400)
-        
-        # Extract and sanitize input
-        email = sanitize_input(data.get('email', ''))
-        password = data.get('password', '')
-        name = sanitize_input(data.get('name', ''))
-        role = sanitize_input(data.get('role', 'user'))
-        
-        # Validate required fields
-        if not email or not password or not name:
-            return error_response('Email, password, and name are required', 400)
-        
-        # Validate email format
-        if not validate_email(email):
-            return error_response('Invalid email format', 400)
-        
-        # Validate password strength
-        password_valid, password_msg = validate_password(password)
-        if not password_valid:
-            return error_response(password_msg, 400)
-        
-        # Validate role
-        if role not in ['user', 'admin']:
-            role = 'user'
-        
-        # Check if user already exists
-        existing_user = UserModel.find_by_email(email)
-        if existing_user:
-            current_app.logger.warning(f'Registration attempt with existing email: {email}')
-            return error_response('Email already registered', 409)
-        
-        # Hash password
-        password_hash = hash_password(password)
-        
-        # Create user
-        user_id = UserModel.create(
-            email=email,
-            password_hash=password_hash,
-            name=name,
-            role=role
-        )
-        
-        current_app.logger.info(f'New user registered: {email} (ID: {user_id})')
-        
-        return success_response(
-            message='User registered successfully',
-            data={'user_id': user_id, 'email': email},
-            status_code=201
-        )
-        
-    except Exception as e:
-        current_app.logger.error(f'Registration error: {e}')
-        return error_response('Registration failed', 500)
+    req, error = parse_body(RegisterReq)
+    
+    if error:
+        current_app.logger.warning(f'Registration attempt with bad body: {error}')
+        return error_response(error, 400)
+    
+    # Sanitize input
+    email = sanitize_input(req.email)
+    password = req.password
+    name = sanitize_input(req.name)
+    role = sanitize_input(req.role)
+    
+    # Validate required fields
+    if not email or not password or not name:
+        return error_response('Email, password, and name are required', 400)
+    
+    # Validate email format
+    if not validate_email(email):
+        return error_response('Invalid email format', 400)
+    
+    # Validate password strength
+    password_valid, password_msg = validate_password(password)
+    if not password_valid:
+        return error_response(password_msg, 400)
+    
+    # Validate role
+    if role not in VALID_ROLES:
+        role = 'user'
+    
+    # Hash password in the background while the email is checked
+    password_future = hash_password_async(password)
+    
+    # Check if user already exists
+    existing_user = UserModel.find_by_email_cached(email)
+    if existing_user:
+        password_future.cancel()
+        current_app.logger.warning(f'Registration attempt with existing email: {email}')
+        return error_response('Email already registered', 409)
+    
+    password_hash = password_future.result()
+    
+    # Create user
+    user_id = UserModel.create(
+        email=email,
+        password_hash=password_hash,
+        name=name,
+        role=role
+    )
+    
+    current_app.logger.info(f'New user registered: {email} (ID: {user_id})')
+    
+    return success_response(
+        message='User registered successfully',
+        data={'user_id': user_id, 'email': email},
+        status_code=201
+    )
 
 
 @auth_bp.route('/login', methods=['POST'])
+@safe_route('Login')
 def login():
     """
     Authenticate user and return JWT token
@@ -104,58 +114,66 @@ def login():
         - 400: Missing credentials
         - 401: Invalid credentials
     """
-    try:
-        data = request.get_json()
-        
-        if not data:
-            return error_response('Request body is required', 400)
-        
-        email = sanitize_input(data.get('email', ''))
-        password = data.get('password', '')
-        
-        if not email or not password:
-            return error_response('Email and password are required', 400)
-        
-        # Find user by email
-        user = UserModel.find_by_email(email)
-        
-        if not user:
-            current_app.logger.warning(f'Login attempt with unknown email: {email}')
-            return error_response('Invalid email or password', 401)
-        
-        # Verify password
-        if not verify_password(password, user['password_hash']):
-            current_app.logger.warning(f'Failed login attempt for: {email}')
-            return error_response('Invalid email or password', 401)
-        
-        # Generate JWT token
-        token = generate_token(user['id'], user['role'])
-        
-        current_app.logger.info(f'User logged in: {email}')
-        
-        return success_response(
-            message='Login successful',
-            data={
-                'token': token,
-                'user': {
-                    'id': user['id'],
-                    'email': user['email'],
-                    'name': user['name'],
-                    'role': user['role']
-                }
+    req, error = parse_body(LoginReq)
+    
+    if error:
+        return error_response(error, 400)
+    
+    email = sanitize_input(req.email)
+    password = req.password
+    
+    if not email or not password:
+        return error_response('Email and password are required', 400)
+    
+    # Find user by email
+    user = UserModel.find_by_email_cached(email)
+    
+    if not user:
+        current_app.logger.warning(f'Login attempt with unknown email: {email}')
+        return error_response('Invalid email or password', 401)
+    
+    # Verify password
+    if not verify_password(password, user['password_hash']):
+        current_app.logger.warning(f'Failed login attempt for: {email}')
+        return error_response('Invalid email or password', 401)
+    
+    # Migrate bcrypt hashes (and outdated argon2 parameters) on login
+    if needs_rehash(user['password_hash']):
+        UserModel.update_password(user['id'], hash_password(password))
+    
+    # Generate JWT token
+    token = generate_token(
+        user['id'],
+        user['role'],
+        email=user['email'],
+        name=user['name'],
+        created_at=user['created_at']
+    )
+    
+    current_app.logger.info(f'User logged in: {email}')
+    
+    return success_response(
+        message='Login successful',
+        data={
+            'token': token,
+            'user': {
+                'id': user['id'],
+                'email': user['email'],
+                'name': user['name'],
+                'role': user['role']
             }
-        )
-        
-    except Exception as e:
-        current_app.logger.error(f'Login error: {e}')
-        return error_response('Login failed', 500)
+        }
+    )
 
 
 @auth_bp.route('/me', methods=['GET'])
 @token_required
+@safe_route('Get user', 'Failed to retrieve user')
 def get_current_user(current_user):
     """
     Get current authenticated user details
+    Served from the token's claims; tokens issued without profile
+    claims fall back to a (cached) database lookup
     
     Headers:
         - Authorization: Bearer <token>
@@ -164,34 +182,43 @@ def get_current_user(current_user):
         - 200: User details
         - 401: Unauthorized
     """
-    try:
-        user = UserModel.find_by_id(current_user['user_id'])
-        
-        if not user:
-            return error_response('User not found', 404)
-        
+    if current_user['email'] is not None:
         return success_response(
             message='User retrieved successfully',
             data={
-                'id': user['id'],
-                'email': user['email'],
-                'name': user['name'],
-                'role': user['role'],
-                'created_at': str(user['created_at'])
+                'id': current_user['user_id'],
+                'email': current_user['email'],
+                'name': current_user['name'],
+                'role': current_user['role'],
+                'created_at': current_user['created_at']
             }
         )
-        
-    except Exception as e:
-        current_app.logger.error(f'Get user error: {e}')
-        return error_response('Failed to retrieve user', 500)
+    
+    user = get_user_cached(current_user['user_id'])
+    
+    if not user:
+        return error_response('User not found', 404)
+    
+    return success_response(
+        message='User retrieved successfully',
+        data={
+            'id': user['id'],
+            'email': user['email'],
+            'name': user['name'],
+            'role': user['role'],
+            'created_at': user['created_at']
+        }
+    )
 
 
 @auth_bp.route('/users', methods=['GET'])
 @token_required
 @admin_required
+@safe_route('Get users', 'Failed to retrieve users')
 def get_all_users(current_user):
     """
     Get all users (Admin only)
+    The user list is streamed from a server-side cursor
     
     Headers:
         - Authorization: Bearer <token>
@@ -201,42 +228,38 @@ def get_all_users(current_user):
         - 401: Unauthorized
         - 403: Forbidden (not admin)
     """
-    try:
-        users = UserModel.find_all()
-        
-        # Remove password hashes from response
-        user_list = []
-        for user in users:
-            user_list.append({
-                'id': user['id'],
-                'email': user['email'],
-                'name': user['name'],
-                'role': user['role'],
-                'created_at': str(user['created_at'])
-            })
-        
-        return success_response(
-            message='Users retrieved successfully',
-            data={'users': user_list, 'total': len(user_list)}
-        )
-        
-    except Exception as e:
-        current_app.logger.error(f'Get users error: {e}')
-        return error_response('Failed to retrieve users', 500)
+    users = UserModel.iter_all()
+    
+    # Only public fields go into the response
+    user_list = (
+        dict(zip(_USER_KEYS, _user_fields(user)))
+        for user in users
+    )
+    
+    return streamed_response(
+        message='Users retrieved successfully',
+        key='users',
+        items=user_list,
+        count_key='total'
+    )
 
 
 @auth_bp.route('/logout', methods=['POST'])
 @token_required
+@safe_route('Logout')
 def logout(current_user):
     """
-    Logout user (client-side token removal)
+    Logout user and revoke the current token
     
-    Note: JWT tokens are stateless, so actual invalidation
-    would require a token blacklist (not implemented for simplicity)
+    The token's jti is blacklisted until the token expires
     
     Returns:
         - 200: Logout successful
+        - 503: Token could not be revoked
     """
+    if current_user['jti'] and not revoke(current_user['jti'], current_user['exp']):
+        return error_response('Logout failed, token could not be revoked', 503)
+    
     current_app.logger.info(f'User logged out: {current_user["user_id"]}')
     
     return success_response(
@@ -5,16 +5,56 @@ CRUD operations for tasks with role-based access
 
 from flask import Blueprint, request, current_app
 from app.models.task_model import TaskModel
-from app.utils.validators import sanitize_input
-from app.utils.responses import success_response, error_response
+from app.utils.validators import sanitize_input, validate_task_fields
+from app.utils.pagination import decode_cursor, next_cursor
+from app.utils.responses import success_response, error_response, streamed_response, safe_route
+from app.utils.schemas import UNSET, TaskCreateReq, TaskUpdateReq, parse_body
 from app.middleware.auth_middleware import token_required
 from app.middleware.role_check import admin_required
 
 task_bp = Blueprint('tasks', __name__)
 
 
+def _serialize_tasks(columns, rows):
+    """
+    Build task dicts from tuple rows
+    
+    Args:
+        columns: Column names
+        rows: Task row tuples
+    
+    Returns:
+        List of task dicts
+    """
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def _parse_pagination(default_limit=10, max_limit=100):
+    """
+    Read page/limit query parameters
+    
+    Args:
+        default_limit: Limit used when missing or out of range
+        max_limit: Largest accepted limit
+    
+    Returns:
+        Tuple of (page, limit, offset)
+    """
+    page = int(request.args.get('page', 1))
+    limit = int(request.args.get('limit', default_limit))
+    
+    # Validate pagination
+    if page < 1:
+        page = 1
+    if limit < 1 or limit > max_limit:
+        limit = default_limit
+    
+    return page, limit, (page - 1) * limit
+
+
 @task_bp.route('', methods=['POST'])
 @token_required
+@safe_route('Create task', 'Failed to create task')
 def create_task(current_user):
     """
     Create a new task
@@ -31,56 +71,46 @@ def create_task(current_user):
         - 201: Task created successfully
         - 400: Validation error
     """
-    try:
-        data = request.get_json()
-        
-        if not data:
-            return error_response('Request body is required', 400)
-        
-        title = sanitize_input(data.get('title', ''))
-        description = sanitize_input(data.get('description', ''))
-        status = sanitize_input(data.get('status', 'pending'))
-        
-        # Validate title
-        if not title:
-            return error_response('Task title is required', 400)
-        
-        if len(title) > 200:
-            return error_response('Title must be less than 200 characters', 400)
-        
-        # Validate status
-        valid_statuses = ['pending', 'in_progress', 'completed', 'cancelled']
-        if status not in valid_statuses:
-            return error_response(
-                f'Invalid status. Must be one of: {", ".join(valid_statuses)}', 
-                400
-            )
-        
-        # Create task
-        task_id = TaskModel.create(
-            title=title,
-            description=description,
-            status=status,
-            user_id=current_user['user_id']
-        )
-        
-        current_app.logger.info(
-            f'Task created: {task_id} by user {current_user["user_id"]}'
-        )
-        
-        return success_response(
-            message='Task created successfully',
-            data={'task_id': task_id},
-            status_code=201
-        )
-        
-    except Exception as e:
-        current_app.logger.error(f'Create task error: {e}')
-        return error_response('Failed to create task', 500)
+    req, error = parse_body(TaskCreateReq)
+    
+    if error:
+        return error_response(error, 400)
+    
+    title = sanitize_input(req.title)
+    description = sanitize_input(req.description)
+    status = sanitize_input(req.status)
+    
+    # Validate title
+    if not title:
+        return error_response('Task title is required', 400)
+    
+    # Validate title length and status
+    valid, error = validate_task_fields(title, status)
+    if not valid:
+        return error_response(error, 400)
+    
+    # Create task
+    task_id = TaskModel.create(
+        title=title,
+        description=description,
+        status=status,
+        user_id=current_user['user_id']
+    )
+    
+    current_app.logger.info(
+        f'Task created: {task_id} by user {current_user["user_id"]}'
+    )
+    
+    return success_response(
+        message='Task created successfully',
+        data={'task_id': task_id},
+        status_code=201
+    )
 
 
 @task_bp.route('', methods=['GET'])
 @token_required
+@safe_route('Get tasks', 'Failed to retrieve tasks')
 def get_tasks(current_user):
     """
     Get tasks for current user
@@ -94,77 +124,67 @@ def get_tasks(current_user):
         - status: Filter by status
         - page: Page number (default: 1)
         - limit: Items per page (default: 10)
+        - cursor: next_cursor from the previous page (replaces page)
     
     Returns:
         - 200: List of tasks
+        - 400: Invalid cursor
     """
-    try:
-        # Parse query parameters
-        show_all = request.args.get('all', 'false').lower() == 'true'
-        status_filter = request.args.get('status', None)
-        page = int(request.args.get('page', 1))
-        limit = int(request.args.get('limit', 10))
-        
-        # Validate pagination
-        if page < 1:
-            page = 1
-        if limit < 1 or limit > 100:
-            limit = 10
-        
-        offset = (page - 1) * limit
-        
-        # Get tasks based on role
-        if show_all and current_user['role'] == 'admin':
-            tasks = TaskModel.find_all(
-                status=status_filter,
-                limit=limit,
-                offset=offset
-            )
-            total = TaskModel.count_all(status=status_filter)
-        else:
-            tasks = TaskModel.find_by_user(
-                user_id=current_user['user_id'],
-                status=status_filter,
-                limit=limit,
-                offset=offset
-            )
-            total = TaskModel.count_by_user(
-                user_id=current_user['user_id'],
-                status=status_filter
-            )
-        
-        # Format response
-        task_list = []
-        for task in tasks:
-            task_list.append({
-                'id': task['id'],
-                'title': task['title'],
-                'description': task['description'],
-                'status': task['status'],
-                'user_id': task['user_id'],
-                'created_at': str(task['created_at'])
-            })
-        
-        return success_response(
-            message='Tasks retrieved successfully',
-            data={
-                'tasks': task_list,
-                'pagination': {
-                    'total': total,
-                    'page': page,
-                    'limit': limit,
-                    'pages': (total + limit - 1) // limit
-                }
-            }
+    # Parse query parameters
+    show_all = request.args.get('all', 'false').lower() == 'true'
+    status_filter = request.args.get('status', None)
+    page, limit, offset = _parse_pagination()
+    
+    # Keyset pagination: seek past the last row of the previous page
+    after_created_at = after_id = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            after_created_at, after_id = decode_cursor(cursor)
+        except ValueError as e:
+            return error_response(str(e), 400)
+    
+    # Get tasks based on role; rows and total in a single round trip
+    if show_all and current_user['role'] == 'admin':
+        columns, rows, total = TaskModel.find_all_with_total(
+            status=status_filter,
+            limit=limit,
+            offset=offset,
+            after_created_at=after_created_at,
+            after_id=after_id,
+            include_user=True
+        )
+    else:
+        columns, rows, total = TaskModel.find_by_user_with_total(
+            user_id=current_user['user_id'],
+            status=status_filter,
+            limit=limit,
+            offset=offset,
+            after_created_at=after_created_at,
+            after_id=after_id
         )
-        
-    except Exception as e:
-        current_app.logger.error(f'Get tasks error: {e}')
-        return error_response('Failed to retrieve tasks', 500)
+    
+    # Format response
+    task_list = _serialize_tasks(columns, rows)
+    
+    return success_response(
+        message='Tasks retrieved successfully',
+        data={
+            'tasks': task_list,
+            'pagination': {
+                'total': total,
+                'page': page,
+                'limit': limit,
+                'pages': (total + limit - 1) // limit,
+                'next_cursor': next_cursor(columns, rows, limit)
+            }
+        }
+    )
 
 
 @task_bp.route('/<int:task_id>', methods=['GET'])
 @token_required
+@safe_route('Get task', 'Failed to retrieve task')
 def get_task(current_user, task_id):
     """
     Get a specific task by ID
@@ -178,35 +198,31 @@ def get_task(current_user, task_id):
         - 403: Forbidden
         - 404: Not found
     """
-    try:
-        task = TaskModel.find_by_id(task_id)
-        
-        if not task:
-            return error_response('Task not found', 404)
-        
-        # Check ownership (unless admin)
-        if task['user_id'] != current_user['user_id'] and current_user['role'] != 'admin':
-            return error_response('You do not have permission to view this task', 403)
-        
-        return success_response(
-            message='Task retrieved successfully',
-            data={
-                'id': task['id'],
-                'title': task['title'],
-                'description': task['description'],
-                'status': task['status'],
-                'user_id': task['user_id'],
-                'created_at': str(task['created_at'])
-            }
-        )
-        
-    except Exception as e:
-        current_app.logger.error(f'Get task error: {e}')
-        return error_response('Failed to retrieve task', 500)
+    task = TaskModel.find_by_id(task_id)
+    
+    if not task:
+        return error_response('Task not found', 404)
+    
+    # Check ownership (unless admin)
+    if task['user_id'] != current_user['user_id'] and current_user['role'] != 'admin':
+        return error_response('You do not have permission to view this task', 403)
+    
+    return success_response(
+        message='Task retrieved successfully',
+        data={
+            'id': task['id'],
+            'title': task['title'],
+            'description': task['description'],
+            'status': task['status'],
+            'user_id': task['user_id'],
+            'created_at': task['created_at']
+        }
+    )
 
 
 @task_bp.route('/<int:task_id>', methods=['PUT'])
 @token_required
+@safe_route('Update task', 'Failed to update task')
 def update_task(current_user, task_id):
     """
     Update a task
@@ -225,70 +241,65 @@ def update_task(current_user, task_id):
         - 403: Forbidden
         - 404: Not found
     """
-    try:
-        task = TaskModel.find_by_id(task_id)
-        
-        if not task:
-            return error_response('Task not found', 404)
-        
-        # Check ownership (users can only update their own tasks)
-        if task['user_id'] != current_user['user_id']:
-            return error_response('You do not have permission to update this task', 403)
-        
-        data = request.get_json()
-        
-        if not data:
-            return error_response('Request body is required', 400)
-        
-        # Get update fields
-        title = sanitize_input(data.get('title', task['title']))
-        description = sanitize_input(data.get('description', task['description']))
-        status = sanitize_input(data.get('status', task['status']))
-        
-        # Validate title
-        if not title:
-            return error_response('Task title cannot be empty', 400)
-        
-        if len(title) > 200:
-            return error_response('Title must be less than 200 characters', 400)
-        
-        # Validate status
-        valid_statuses = ['pending', 'in_progress', 'completed', 'cancelled']
-        if status not in valid_statuses:
-            return error_response(
-                f'Invalid status. Must be one of: {", ".join(valid_statuses)}',
-                400
-            )
-        
-        # Update task
-        TaskModel.update(
-            task_id=task_id,
-            title=title,
-            description=description,
-            status=status
-        )
-        
-        current_app.logger.info(
-            f'Task updated: {task_id} by user {current_user["user_id"]}'
-        )
-        
-        return success_response(
-            message='Task updated successfully',
-            data={
-                'id': task_id,
-                'title': title,
-                'description': description,
-                'status': status
-            }
-        )
-        
-    except Exception as e:
-        current_app.logger.error(f'Update task error: {e}')
-        return error_response('Failed to update task', 500)
+    task = TaskModel.find_by_id(task_id)
+    
+    if not task:
+        return error_response('Task not found', 404)
+    
+    # Check ownership (users can only update their own tasks)
+    if task['user_id'] != current_user['user_id']:
+        return error_response('You do not have permission to update this task', 403)
+    
+    req, error = parse_body(TaskUpdateReq)
+    
+    if not error and req.title is UNSET and req.description is UNSET and req.status is UNSET:
+        error = 'Request body is required'
+    
+    if error:
+        return error_response(error, 400)
+    
+    # Get update fields, keeping current values for omitted ones
+    title = sanitize_input(task['title'] if req.title is UNSET else req.title)
+    description = sanitize_input(
+        task['description'] if req.description is UNSET else req.description
+    )
+    status = sanitize_input(task['status'] if req.status is UNSET else req.status)
+    
+    # Validate title
+    if not title:
+        return error_response('Task title cannot be empty', 400)
+    
+    # Validate title length and status
+    valid, error = validate_task_fields(title, status)
+    if not valid:
+        return error_response(error, 400)
+    
+    # Update task
+    TaskModel.update(
+        task_id=task_id,
+        title=title,
+        description=description,
+        status=status
+    )
+    
+    current_app.logger.info(
+        f'Task updated: {task_id} by user {current_user["user_id"]}'
+    )
+    
+    return success_response(
+        message='Task updated successfully',
+        data={
+            'id': task_id,
+            'title': title,
+            'description': description,
+            'status': status
+        }
+    )
 
 
 @task_bp.route('/<int:task_id>', methods=['DELETE'])
 @token_required
+@safe_route('Delete task', 'Failed to delete task')
 def delete_task(current_user, task_id):
     """
     Delete a task
@@ -302,36 +313,33 @@ def delete_task(current_user, task_id):
         - 403: Forbidden
         - 404: Not found
     """
-    try:
-        task = TaskModel.find_by_id(task_id)
-        
-        if not task:
-            return error_response('Task not found', 404)
-        
-        # Check ownership (unless admin)
-        if task['user_id'] != current_user['user_id'] and current_user['role'] != 'admin':
-            return error_response('You do not have permission to delete this task', 403)
-        
-        # Delete task
-        TaskModel.delete(task_id)
-        
-        current_app.logger.info(
-            f'Task deleted: {task_id} by user {current_user["user_id"]}'
-        )
-        
-        return success_response(message='Task deleted successfully')
-        
-    except Exception as e:
-        current_app.logger.error(f'Delete task error: {e}')
-        return error_response('Failed to delete task', 500)
+    task = TaskModel.find_by_id(task_id)
+    
+    if not task:
+        return error_response('Task not found', 404)
+    
+    # Check ownership (unless admin)
+    if task['user_id'] != current_user['user_id'] and current_user['role'] != 'admin':
+        return error_response('You do not have permission to delete this task', 403)
+    
+    # Delete task
+    TaskModel.delete(task_id)
+    
+    current_app.logger.info(
+        f'Task deleted: {task_id} by user {current_user["user_id"]}'
+    )
+    
+    return success_response(message='Task deleted successfully')
 
 
 @task_bp.route('/admin/all', methods=['GET'])
 @token_required
 @admin_required
+@safe_route('Admin get tasks', 'Failed to retrieve tasks')
 def admin_get_all_tasks(current_user):
     """
     Get all tasks (Admin only endpoint)
+    The task list is streamed from a server-side cursor
     
     Headers:
         - Authorization: Bearer <token>
@@ -339,46 +347,49 @@ def admin_get_all_tasks(current_user):
     Query Parameters:
         - status: Filter by status
         - user_id: Filter by user
+        - page: Page number (default: 1)
+        - limit: Items per page (default: 100, max: 1000)
     
     Returns:
-        - 200: List of all tasks
+        - 200: Page of tasks with the total across all pages
     """
-    try:
-        status_filter = request.args.get('status', None)
-        user_id_filter = request.args.get('user_id', None)
-        
-        if user_id_filter:
-            user_id_filter = int(user_id_filter)
-        
-        tasks = TaskModel.find_all(
-            status=status_filter,
-            user_id=user_id_filter
-        )
-        
-        task_list = []
-        for task in tasks:
-            task_list.append({
-                'id': task['id'],
-                'title': task['title'],
-                'description': task['description'],
-                'status': task['status'],
-                'user_id': task['user_id'],
-                'created_at': str(task['created_at'])
-            })
-        
-        return success_response(
-            message='All tasks retrieved successfully',
-            data={'tasks': task_list, 'total': len(task_list)}
-        )
-        
-    except Exception as e:
-        current_app.logger.error(f'Admin get tasks error: {e}')
-        return error_response('Failed to retrieve tasks', 500)
+    status_filter = request.args.get('status', None)
+    user_id_filter = request.args.get('user_id', None)
+    page, limit, offset = _parse_pagination(default_limit=100, max_limit=1000)
+    
+    if user_id_filter:
+        user_id_filter = int(user_id_filter)
+    
+    total = TaskModel.count_all(status=status_filter, user_id=user_id_filter)
+    
+    tasks = TaskModel.iter_all(
+        status=status_filter,
+        user_id=user_id_filter,
+        limit=limit,
+        offset=offset,
+        include_user=True
+    )
+    
+    return streamed_response(
+        message='All tasks retrieved successfully',
+        key='tasks',
+        items=tasks,
+        data={
+            'total': total,
+            'pagination': {
+                'total': total,
+                'page': page,
+                'limit': limit,
+                'pages': (total + limit - 1) // limit
+            }
+        }
+    )
 
 
 @task_bp.route('/admin/<int:task_id>', methods=['DELETE'])
 @token_required
 @admin_required
+@safe_route('Admin delete task', 'Failed to delete task')
 def admin_delete_task(current_user, task_id):
     """
     Admin delete any task
@@ -390,20 +401,15 @@ def admin_delete_task(current_user, task_id):
         - 200: Task deleted successfully
         - 404: Not found
     """
-    try:
-        task = TaskModel.find_by_id(task_id)
-        
-        if not task:
-            return error_response('Task not found', 404)
-        
-        TaskModel.delete(task_id)
-        
-        current_app.logger.info(
-            f'Task {task_id} deleted by admin {current_user["user_id"]}'
-        )
-        
-        return success_response(message='Task deleted successfully by admin')
-        
-    except Exception as e:
-        current_app.logger.error(f'Admin delete task error: {e}')
-        return error_response('Failed to delete task', 500)
\ No newline at end of file
+    task = TaskModel.find_by_id(task_id)
+    
+    if not task:
+        return error_response('Task not found', 404)
+    
+    TaskModel.delete(task_id)
+    
+    current_app.logger.info(
+        f'Task {task_id} deleted by admin {current_user["user_id"]}'
+    )
+    
+    return success_response(message='Task deleted successfully by admin')
\ No newline at end of file
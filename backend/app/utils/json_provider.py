@@ -0,0 +1,44 @@
+"""
+JSON Provider
+Flask JSON provider backed by orjson
+"""
+
+import decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+
+def json_default(obj):
+    """
+    Serialize types orjson does not handle natively
+    """
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Serializes responses with orjson instead of the stdlib json module
+    Used by jsonify() and request.get_json()
+    """
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=json_default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # orjson already produces bytes, skip the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        
+        return self._app.response_class(
+            orjson.dumps(obj, default=json_default),
+            mimetype='application/json'
+        )
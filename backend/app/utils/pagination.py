@@ -0,0 +1,68 @@
+"""
+Pagination Utilities
+Opaque cursors for keyset (seek) pagination
+"""
+
+import base64
+from datetime import datetime
+
+
+def encode_cursor(created_at, task_id):
+    """
+    Encode the last row of a page as an opaque cursor
+    
+    Args:
+        created_at: Row creation timestamp
+        task_id: Row ID
+    
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f'{created_at.isoformat()}|{task_id}'
+    
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor
+    
+    Args:
+        cursor: Cursor string from the client
+    
+    Returns:
+        Tuple of (created_at, task_id)
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, task_id = raw.rsplit('|', 1)
+        
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError('Invalid pagination cursor') from e
+
+
+def next_cursor(columns, rows, limit):
+    """
+    Build the cursor for the page after the given rows
+    
+    Args:
+        columns: Column names
+        rows: Row tuples of the current page
+        limit: Page size
+    
+    Returns:
+        Cursor string, or None if this is the last page
+    """
+    if len(rows) < limit:
+        return None
+    
+    last = rows[-1]
+    
+    return encode_cursor(
+        last[columns.index('created_at')],
+        last[columns.index('id')]
+    )
@@ -1,14 +1,43 @@
 """
 Password Utilities
-Handles password hashing and verification using bcrypt
+Handles password hashing and verification using argon2id
+Legacy bcrypt hashes are still verified and migrated on login
 """
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError
+from app.config import Config
+
+# argon2id hasher; the parameters are encoded in every hash it produces
+_hasher = PasswordHasher(
+    time_cost=Config.ARGON2_TIME_COST,
+    memory_cost=Config.ARGON2_MEMORY_COST,
+    parallelism=Config.ARGON2_PARALLELISM
+)
+
+# Background hashing pool, created on first use. argon2 and bcrypt
+# release the GIL while hashing, so threads run in parallel without
+# the fork/pickle cost of a process pool; the pool size also caps how
+# many 64 MiB argon2 buffers are live at once.
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _is_bcrypt(password_hash):
+    """
+    Check whether a stored hash is a legacy bcrypt hash ($2a$/$2b$/$2y$)
+    """
+    return password_hash.startswith('$2')
 
 
 def hash_password(password):
     """
-    Hash a password using bcrypt
+    Hash a password using argon2id
     
     Args:
         password: Plain text password
@@ -16,15 +45,30 @@ def hash_password(password):
     Returns:
         Hashed password string
     """
-    # Convert password to bytes
-    password_bytes = password.encode('utf-8')
+    return _hasher.hash(password)
+
+
+def hash_password_async(password):
+    """
+    Start hashing a password on the background pool
+    
+    Args:
+        password: Plain text password
+    
+    Returns:
+        Future resolving to the hashed password string
+    """
+    global _pool
     
-    # Generate salt and hash password
-    salt = bcrypt.gensalt(rounds=12)
-    hashed = bcrypt.hashpw(password_bytes, salt)
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    thread_name_prefix='password-hash'
+                )
     
-    # Return as string for database storage
-    return hashed.decode('utf-8')
+    return _pool.submit(hash_password, password)
 
 
 def verify_password(password, password_hash):
@@ -39,11 +83,36 @@ def verify_password(password, password_hash):
         True if password matches, False otherwise
     """
     try:
-        # Convert to bytes
-        password_bytes = password.encode('utf-8')
-        hash_bytes = password_hash.encode('utf-8')
+        if _is_bcrypt(password_hash):
+            # bcrypt hashes are always 60 characters; the bcrypt library
+            # panics (a BaseException) on shorter ones instead of raising
+            if len(password_hash) != 60:
+                return False
+            return bcrypt.checkpw(
+                password.encode('utf-8'),
+                password_hash.encode('utf-8')
+            )
         
-        # Check password
-        return bcrypt.checkpw(password_bytes, hash_bytes)
+        return _hasher.verify(password_hash, password)
     except Exception:
+        # VerifyMismatchError as well as malformed hashes
+        return False
+
+
+def needs_rehash(password_hash):
+    """
+    Check whether a hash should be replaced with a current argon2id hash
+    
+    Args:
+        password_hash: Stored hash
+    
+    Returns:
+        True for bcrypt hashes and argon2 hashes with outdated parameters
+    """
+    if _is_bcrypt(password_hash):
+        return True
+    
+    try:
+        return _hasher.check_needs_rehash(password_hash)
+    except InvalidHashError:
         return False
\ No newline at end of file
@@ -3,10 +3,27 @@ Response Utilities
 Standardized JSON response formatting
 """
 
-from flask import jsonify
+from functools import wraps
+from typing import Any, Callable, Iterable, Iterator, Optional
 
+import orjson
+from flask import Response, current_app, stream_with_context
+from app.utils.json_provider import json_default
 
-def success_response(message, data=None, status_code=200):
+
+def _json_response(body: dict[str, Any], status_code: int) -> Response:
+    """
+    Serialize straight to response bytes with orjson
+    datetimes are written natively as ISO 8601 strings
+    """
+    return current_app.response_class(
+        orjson.dumps(body, default=json_default),
+        status=status_code,
+        mimetype='application/json'
+    )
+
+
+def success_response(message: str, data: Any = None, status_code: int = 200) -> Response:
     """
     Create a standardized success response
     
@@ -16,7 +33,7 @@ def success_response(message, data=None, status_code=200):
         status_code: HTTP status code (default: 200)
     
     Returns:
-        Flask JSON response tuple
+        Flask JSON response
     """
     response = {
         'success': True,
@@ -26,10 +43,10 @@ def success_response(message, data=None, status_code=200):
     if data is not None:
         response['data'] = data
     
-    return jsonify(response), status_code
+    return _json_response(response, status_code)
 
 
-def error_response(message, status_code=400, errors=None):
+def error_response(message: str, status_code: int = 400, errors: Any = None) -> Response:
     """
     Create a standardized error response
     
@@ -39,7 +56,7 @@ def error_response(message, status_code=400, errors=None):
         errors: Additional error details (optional)
     
     Returns:
-        Flask JSON response tuple
+        Flask JSON response
     """
     response = {
         'success': False,
@@ -49,10 +66,11 @@ def error_response(message, status_code=400, errors=None):
     if errors is not None:
         response['errors'] = errors
     
-    return jsonify(response), status_code
+    return _json_response(response, status_code)
 
 
-def paginated_response(message, data, page, limit, total, status_code=200):
+def paginated_response(message: str, data: Any, page: int, limit: int, total: int,
+                       status_code: int = 200) -> Response:
     """
     Create a standardized paginated response
     
@@ -65,7 +83,7 @@ def paginated_response(message, data, page, limit, total, status_code=200):
         status_code: HTTP status code (default: 200)
     
     Returns:
-        Flask JSON response tuple
+        Flask JSON response
     """
     total_pages = (total + limit - 1) // limit if limit > 0 else 0
     
@@ -83,4 +101,90 @@ def paginated_response(message, data, page, limit, total, status_code=200):
         }
     }
     
-    return jsonify(response), status_code
\ No newline at end of file
+    return _json_response(response, status_code)
+
+
+def streamed_response(message: str, key: str, items: Iterable[Any],
+                      data: Optional[dict[str, Any]] = None,
+                      count_key: Optional[str] = None) -> Response:
+    """
+    Create a success response whose data[key] list is streamed
+    
+    The body has the same shape as success_response but is written
+    item by item, so the full list is never held in memory. Anything
+    that can fail before the first item (e.g. running the query, see
+    stream_query) should happen before this is called.
+    
+    Args:
+        message: Success message
+        key: Name of the streamed list inside data
+        items: Iterable of JSON-serializable items
+        data: Other fields for data, written before the list (optional)
+        count_key: If set, the number of items is added to data
+            under this name after the list (optional)
+    
+    Returns:
+        Flask streaming response
+    """
+    fields = orjson.dumps(data or {})[1:-1]
+    
+    def generate() -> Iterator[bytes]:
+        yield b''.join((
+            b'{"success":true,"message":', orjson.dumps(message),
+            b',"data":{', fields, b',' if fields else b'',
+            orjson.dumps(key), b':['
+        ))
+        
+        count = 0
+        try:
+            for item in items:
+                chunk = orjson.dumps(item, default=json_default)
+                yield chunk if count == 0 else b',' + chunk
+                count += 1
+        except Exception as e:
+            # The 200 status and part of the body are already sent; log
+            # and re-raise so the server drops the connection instead of
+            # ending a truncated body cleanly
+            current_app.logger.error(f'Streamed response error after {count} items: {e}')
+            raise
+        
+        tail = b']'
+        if count_key:
+            tail += b',' + orjson.dumps(count_key) + b':' + orjson.dumps(count)
+        yield tail + b'}}'
+    
+    return current_app.response_class(
+        stream_with_context(generate()),
+        mimetype='application/json'
+    )
+
+
+def safe_route(name: str, message: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator that turns an unhandled exception in a route into a 500
+    
+    Apply it directly above the view function, below token_required or
+    admin_required, so authentication errors keep their own responses.
+    
+    Args:
+        name: Operation name, logged as "<name> error: <exception>"
+        message: Error message returned to the client
+            (default: "<name> failed")
+    
+    Returns:
+        Route decorator
+    """
+    failed = message or f'{name} failed'
+    
+    def decorator(f: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(f)
+        def decorated(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return f(*args, **kwargs)
+            except Exception as e:
+                current_app.logger.error(f'{name} error: {e}')
+                return error_response(failed, 500)
+        
+        return decorated
+    
+    return decorator
\ No newline at end of file
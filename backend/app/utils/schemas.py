@@ -0,0 +1,71 @@
+"""
+Request Schemas
+Typed request bodies decoded and validated with msgspec
+"""
+
+from typing import Optional, Union
+
+import msgspec
+from msgspec import UNSET, UnsetType
+from flask import request
+
+
+class RegisterReq(msgspec.Struct):
+    """
+    Body of POST /auth/register
+    Missing fields default to empty so the route reports them by name
+    """
+    email: str = ''
+    password: str = ''
+    name: str = ''
+    role: str = 'user'
+
+
+class LoginReq(msgspec.Struct):
+    """
+    Body of POST /auth/login
+    """
+    email: str = ''
+    password: str = ''
+
+
+class TaskCreateReq(msgspec.Struct):
+    """
+    Body of POST /tasks
+    """
+    title: str = ''
+    description: Optional[str] = ''
+    status: str = 'pending'
+
+
+class TaskUpdateReq(msgspec.Struct):
+    """
+    Body of PUT /tasks/<id>
+    Fields left out of the body stay UNSET and keep their current value
+    """
+    title: Union[str, UnsetType] = UNSET
+    description: Union[Optional[str], UnsetType] = UNSET
+    status: Union[str, UnsetType] = UNSET
+
+
+def parse_body(req_type):
+    """
+    Decode and validate the JSON request body in one pass
+    
+    Args:
+        req_type: msgspec Struct class describing the body
+    
+    Returns:
+        Tuple of (request struct or None, error message or None)
+    """
+    body = request.get_data()
+    
+    if not body:
+        return None, 'Request body is required'
+    
+    try:
+        return msgspec.json.decode(body, type=req_type), None
+    except msgspec.ValidationError as e:
+        return None, f'Invalid request body: {e}'
+    except msgspec.DecodeError:
+        return None, 'Request body must be valid JSON'
@@ -0,0 +1,165 @@
+"""
+Token Cache
+Verified-token cache and jti revocation list
+
+Backed by Redis when REDIS_URL is configured, so every worker shares
+the same cache and revocations. Without it both live in-process and
+a logout only takes effect in the worker that handled it.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+import orjson
+from cachetools import TLRUCache, TTLCache
+
+logger = logging.getLogger('app')
+
+# Verified claims are cached at most this long (and never past exp)
+CLAIMS_TTL = 300
+
+# Redis client, bound once by init_token_cache()
+_redis = None
+
+# In-process fallback. Local claims keep the shorter 60s TTL; revoked
+# jtis expire together with the token they revoke.
+_local_claims = TTLCache(maxsize=10000, ttl=60)
+_local_revoked = TLRUCache(maxsize=100000, ttu=lambda _jti, exp, _now: exp, timer=time.time)
+_local_lock = threading.Lock()
+
+
+def init_token_cache(app):
+    """
+    Connect to Redis if REDIS_URL is set
+    Called during app startup
+    """
+    global _redis
+    
+    redis_url = app.config.get('REDIS_URL')
+    
+    if not redis_url:
+        _redis = None
+        app.logger.info('Token cache: in-process (REDIS_URL not set)')
+        return
+    
+    # Optional dependency, only needed when Redis is configured
+    import redis
+    
+    _redis = redis.Redis.from_url(redis_url)
+    app.logger.info('Token cache: Redis')
+
+
+def _cache_key(token):
+    return 'session:cache:' + hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def validate_cached(token, verify):
+    """
+    Return the claims of a verified token, verifying only on a cache miss
+    
+    Args:
+        token: JWT token string
+        verify: Callable that verifies the token and returns its claims
+            (raises on an invalid or expired token)
+    
+    Returns:
+        Token claims dict
+    """
+    now = time.time()
+    
+    if _redis is not None:
+        key = _cache_key(token)
+        
+        try:
+            cached = _redis.get(key)
+        except Exception as e:
+            logger.warning('Token cache read failed: %s', e)
+            return verify(token)
+        
+        if cached is not None:
+            claims = orjson.loads(cached)
+            if claims['exp'] > now:
+                return claims
+        
+        claims = verify(token)
+        ttl = min(CLAIMS_TTL, int(claims['exp'] - now))
+        
+        if ttl > 0:
+            try:
+                _redis.setex(key, ttl, orjson.dumps(claims))
+            except Exception as e:
+                logger.warning('Token cache write failed: %s', e)
+        
+        return claims
+    
+    with _local_lock:
+        claims = _local_claims.get(token)
+    
+    if claims is not None and claims['exp'] > now:
+        return claims
+    
+    claims = verify(token)
+    
+    with _local_lock:
+        _local_claims[token] = claims
+    
+    return claims
+
+
+def revoke(jti, exp):
+    """
+    Revoke a token by its jti until it would have expired anyway
+    
+    Args:
+        jti: Token ID claim
+        exp: Token expiry (epoch seconds)
+    
+    Returns:
+        True if the token is revoked, False if it could not be
+        (no jti, or Redis is unreachable)
+    """
+    if not jti:
+        return False
+    
+    if _redis is not None:
+        ttl = max(1, int(exp - time.time()))
+        try:
+            _redis.setex(f'revoked:{jti}', ttl, 1)
+        except Exception as e:
+            logger.warning('Token revocation failed: %s', e)
+            return False
+        return True
+    
+    with _local_lock:
+        _local_revoked[jti] = exp
+    
+    return True
+
+
+def is_revoked(jti):
+    """
+    Check whether a token has been revoked
+    
+    Tokens issued before jti was added cannot be revoked. If Redis is
+    unreachable the check fails open so authentication keeps working.
+    
+    Args:
+        jti: Token ID claim (may be None)
+    
+    Returns:
+        True if the token was revoked
+    """
+    if not jti:
+        return False
+    
+    if _redis is not None:
+        try:
+            return bool(_redis.exists(f'revoked:{jti}'))
+        except Exception as e:
+            logger.warning('Revocation check failed: %s', e)
+            return False
+    
+    with _local_lock:
+        return jti in _local_revoked
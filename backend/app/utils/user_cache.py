@@ -0,0 +1,54 @@
+"""
+User Cache
+Process-local TTL cache for user lookups by ID
+"""
+
+import threading
+from cachetools import TTLCache
+
+# Each worker process has its own cache; entries expire after 60s so
+# changes made by another worker are picked up within that window.
+# For multi-worker deploys this can be swapped for Redis
+# (e.g. a JSON payload under f"user:{user_id}" with the same TTL).
+_user_cache = TTLCache(maxsize=10000, ttl=60)
+_user_cache_lock = threading.RLock()
+
+
+def get_user_cached(user_id):
+    """
+    Get a user by ID, hitting the database only on a cache miss
+    
+    Args:
+        user_id: User's database ID
+    
+    Returns:
+        User dict or None
+    """
+    with _user_cache_lock:
+        user = _user_cache.get(user_id)
+    
+    if user is not None:
+        return user
+    
+    # Imported here: the user model invalidates through this module
+    from app.models.user_model import UserModel
+    
+    user = UserModel.find_by_id(user_id)
+    
+    # Missing users are not cached so a new signup is visible at once
+    if user:
+        with _user_cache_lock:
+            _user_cache[user_id] = user
+    
+    return user
+
+
+def invalidate(user_id):
+    """
+    Drop a user from the cache after it has been modified
+    
+    Args:
+        user_id: User's database ID
+    """
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
@@ -4,10 +4,40 @@ Handles input sanitization and validation
 """
 
 import re
-import html
+from typing import Any, Optional
 
+# Compiled once at import rather than looked up per call
+# Simple but effective email regex pattern
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
-def validate_email(email):
+# Same escapes as html.escape(quote=True), applied in one pass
+_HTML_ESC_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;'
+})
+
+_TASK_STATUSES: frozenset[str] = frozenset({'pending', 'in_progress', 'completed', 'cancelled'})
+_TASK_STATUS_ERROR = 'Invalid status. Must be one of: pending, in_progress, completed, cancelled'
+_TASK_TITLE_MAX = 200
+_TASK_TITLE_ERROR = f'Title must be less than {_TASK_TITLE_MAX} characters'
+
+# Character classes required in a password, one bit each
+_NEED_UPPER = 1
+_NEED_LOWER = 2
+_NEED_DIGIT = 4
+
+# Error for the first missing class (lowest remaining bit)
+_PASSWORD_CLASS_ERRORS: dict[int, str] = {
+    _NEED_UPPER: "Password must contain at least one uppercase letter",
+    _NEED_LOWER: "Password must contain at least one lowercase letter",
+    _NEED_DIGIT: "Password must contain at least one digit"
+}
+
+
+def validate_email(email: Optional[str]) -> bool:
     """
     Validate email format
     
@@ -20,13 +50,10 @@ def validate_email(email):
     if not email:
         return False
     
-    # Simple but effective email regex pattern
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
-def validate_password(password):
+def validate_password(password: Optional[str]) -> tuple[bool, str]:
     """
     Validate password strength
     
@@ -48,19 +75,29 @@ def validate_password(password):
     if len(password) < 8:
         return False, "Password must be at least 8 characters long"
     
-    if not re.search(r'[A-Z]', password):
-        return False, "Password must contain at least one uppercase letter"
-    
-    if not re.search(r'[a-z]', password):
-        return False, "Password must contain at least one lowercase letter"
-    
-    if not re.search(r'\d', password):
-        return False, "Password must contain at least one digit"
+    # Single pass over the password, stopping once every class is seen
+    need = _NEED_UPPER | _NEED_LOWER | _NEED_DIGIT
+    
+    for ch in password:
+        c = ord(ch)
+        if 65 <= c <= 90:
+            need &= ~_NEED_UPPER
+        elif 97 <= c <= 122:
+            need &= ~_NEED_LOWER
+        elif ch.isdecimal():
+            # Matches what \d accepted, including non-ASCII digits
+            need &= ~_NEED_DIGIT
+        
+        if not need:
+            break
+    
+    if need:
+        return False, _PASSWORD_CLASS_ERRORS[need & -need]
     
     return True, "Password is valid"
 
 
-def sanitize_input(value):
+def sanitize_input(value: Any) -> str:
     """
     Sanitize user input to prevent XSS and injection
     
@@ -79,13 +116,15 @@ def sanitize_input(value):
     # Strip leading/trailing whitespace
     value = value.strip()
     
-    # Escape HTML entities
-    value = html.escape(value)
+    # Letters and digits only: nothing to escape
+    if value.isalnum():
+        return value
     
-    return value
+    # Escape HTML entities
+    return value.translate(_HTML_ESC_TABLE)
 
 
-def validate_task_status(status):
+def validate_task_status(status: Optional[str]) -> bool:
     """
     Validate task status value
     
@@ -95,12 +134,31 @@ def validate_task_status(status):
     Returns:
         True if valid, False otherwise
     """
-    valid_statuses = ['pending', 'in_progress', 'completed', 'cancelled']
+    return status in _TASK_STATUSES
+
+
+def validate_task_fields(title: str, status: str) -> tuple[bool, Optional[str]]:
+    """
+    Validate title length and status shared by task create and update
+    
+    Args:
+        title: Sanitized, non-empty task title
+        status: Sanitized task status
+    
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    if len(title) > _TASK_TITLE_MAX:
+        return False, _TASK_TITLE_ERROR
+    
+    if not validate_task_status(status):
+        return False, _TASK_STATUS_ERROR
     
-    return status in valid_statuses
+    return True, None
 
 
-def validate_string_length(value, min_length=1, max_length=255):
+def validate_string_length(value: Optional[str], min_length: int = 1,
+                           max_length: int = 255) -> tuple[bool, str]:
     """
     Validate string length
     
@@ -14,6 +14,8 @@ const API_BASE_URL = 'http://localhost:5000/api/v1';
 let currentUser = null;
 let currentPage = 1;
 let itemsPerPage = 10;
+// Keyset cursor that starts each page (index 0 = page 1, no cursor)
+let pageCursors = [null];
 let taskToDelete = null;
 
 // ========================================
@@ -239,6 +241,12 @@ async function loadTasks() {
     
     let endpoint = `/tasks?page=${currentPage}&limit=${itemsPerPage}`;
     
+    // Seek from the previous page's last task when its cursor is known
+    const cursor = pageCursors[currentPage - 1];
+    if (cursor) {
+        endpoint += `&cursor=${encodeURIComponent(cursor)}`;
+    }
+    
     if (statusFilter) {
         endpoint += `&status=${statusFilter}`;
     }
@@ -267,6 +275,7 @@ async function loadTasks() {
         }
         
         // Update pagination
+        pageCursors[currentPage] = pagination.next_cursor;
         updatePagination(pagination);
     } else {
         container.innerHTML = '<p class="error">Failed to load tasks</p>';
@@ -575,6 +584,7 @@ function setupDashboardEventListeners() {
     // Filter change
     document.getElementById('filter-status').addEventListener('change', () => {
         currentPage = 1;
+        pageCursors = [null];
         loadTasks();
     });
     
@@ -583,6 +593,7 @@ function setupDashboardEventListeners() {
     if (showAllCheckbox) {
         showAllCheckbox.addEventListener('change', () => {
             currentPage = 1;
+            pageCursors = [null];
             loadTasks();
         });
     }
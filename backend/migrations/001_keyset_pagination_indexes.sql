@@ -0,0 +1,36 @@
+-- Keyset Pagination Indexes
+-- Upgrades databases created from an older schema.sql; new databases
+-- already get these indexes from schema.sql
+--
+-- Task listings page with (created_at, id) < (...) ORDER BY
+-- created_at DESC, id DESC. Without these indexes every page is a
+-- filesort over the matching rows.
+
+-- ============================================
+-- MySQL Version (8.0+, earlier versions ignore DESC in index definitions)
+-- ============================================
+
+-- idx_tasks_created_at (created_at) stays as it is: InnoDB secondary
+-- indexes already end in the primary key, so it is (created_at, id)
+
+ALTER TABLE tasks
+    ADD INDEX idx_tasks_user_created (user_id, created_at DESC, id DESC);
+
+
+-- ============================================
+-- PostgreSQL Version (Alternative)
+-- ============================================
+
+/*
+-- CONCURRENTLY avoids blocking writes while the indexes build; run
+-- these statements outside a transaction block (e.g. plain psql)
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_user_created
+    ON tasks(user_id, created_at DESC, id DESC);
+
+-- Replace idx_tasks_created_at (created_at) with (created_at DESC, id DESC)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_created_at_id
+    ON tasks(created_at DESC, id DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_created_at;
+ALTER INDEX idx_tasks_created_at_id RENAME TO idx_tasks_created_at;
+*/
@@ -36,7 +36,9 @@ CREATE TABLE IF NOT EXISTS tasks (
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     INDEX idx_tasks_user_id (user_id),
     INDEX idx_tasks_status (status),
-    INDEX idx_tasks_created_at (created_at)
+    INDEX idx_tasks_created_at (created_at),
+    -- Keyset pagination of a user's tasks (ORDER BY created_at DESC, id DESC)
+    INDEX idx_tasks_user_created (user_id, created_at DESC, id DESC)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Insert default admin user (password: Admin123)
@@ -90,7 +92,10 @@ CREATE TABLE IF NOT EXISTS tasks (
 -- Create indexes
 CREATE INDEX idx_tasks_user_id ON tasks(user_id);
 CREATE INDEX idx_tasks_status ON tasks(status);
-CREATE INDEX idx_tasks_created_at ON tasks(created_at);
+-- Keyset pagination of all tasks (admin listing)
+CREATE INDEX idx_tasks_created_at ON tasks(created_at DESC, id DESC);
+-- Keyset pagination of a user's tasks (ORDER BY created_at DESC, id DESC)
+CREATE INDEX idx_tasks_user_created ON tasks(user_id, created_at DESC, id DESC);
 
 -- Create function for updating updated_at
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -0,0 +1,125 @@
+"""
+Shared pytest fixtures
+The app fixture is a bare Flask app, so no database server is needed;
+model tests run their real SQL against an in-memory SQLite database
+"""
+
+import sqlite3
+
+import pytest
+from flask import Flask
+
+from app.middleware.auth_middleware import init_auth
+from app.utils import token_cache
+
+SCHEMA = """
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY,
+        email TEXT NOT NULL UNIQUE,
+        password_hash TEXT NOT NULL DEFAULT '',
+        name TEXT NOT NULL,
+        role TEXT NOT NULL DEFAULT 'user',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE tasks (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        description TEXT,
+        status TEXT NOT NULL DEFAULT 'pending',
+        user_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+
+class SqliteDB:
+    """
+    Runs the statements the models build, with the execute_query /
+    stream_query call signatures, so their SQL is exercised as written
+    """
+    
+    def __init__(self):
+        self.conn = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES)
+        self.conn.executescript(SCHEMA)
+        self.queries = []
+    
+    def execute_query(self, query, params=None, fetch_one=False, fetch_all=False,
+                      commit=False, prepared=False, row_format='dict'):
+        self.queries.append(query)
+        cursor = self.conn.execute(query.replace('%s', '?'), params or ())
+        
+        if commit:
+            self.conn.commit()
+            return cursor.lastrowid
+        if not (fetch_one or fetch_all):
+            return None
+        
+        columns = tuple(column[0] for column in cursor.description)
+        result = cursor.fetchone() if fetch_one else cursor.fetchall()
+        
+        if row_format == 'tuple':
+            return columns, result
+        if fetch_one:
+            return dict(zip(columns, result)) if result else None
+        return [dict(zip(columns, row)) for row in result]
+    
+    def stream_query(self, query, params=None, itersize=1000):
+        return iter(self.execute_query(query, params, fetch_all=True))
+    
+    def add_user(self, user_id, name, email=None):
+        self.conn.execute(
+            'INSERT INTO users (id, email, name) VALUES (?, ?, ?)',
+            (user_id, email or f'user{user_id}@example.com', name)
+        )
+    
+    def add_task(self, task_id, user_id, created_at, status='pending'):
+        self.conn.execute(
+            'INSERT INTO tasks (id, title, user_id, created_at, status) VALUES (?, ?, ?, ?, ?)',
+            (task_id, f't{task_id}', user_id, created_at, status)
+        )
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        JWT_SECRET_KEY='test-secret',
+        JWT_EXPIRY_HOURS=1
+    )
+    
+    init_auth(app)
+    
+    return app
+
+
+@pytest.fixture(autouse=True)
+def local_token_cache():
+    """
+    Run every test against an empty in-process token cache
+    """
+    token_cache._redis = None
+    token_cache._local_claims.clear()
+    token_cache._local_revoked.clear()
+    
+    yield
+    
+    token_cache._redis = None
+
+
+@pytest.fixture
+def sql_db(monkeypatch):
+    """
+    SQLite database wired into the task and user models
+    """
+    from app.models import task_model, user_model
+    
+    db = SqliteDB()
+    
+    for module in (task_model, user_model):
+        monkeypatch.setattr(module, 'execute_query', db.execute_query)
+        monkeypatch.setattr(module, 'stream_query', db.stream_query)
+    
+    yield db
+    
+    db.conn.close()
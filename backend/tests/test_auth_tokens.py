@@ -0,0 +1,142 @@
+"""
+HS256 token encode/decode tests
+"""
+
+import base64
+import time
+
+import jwt
+import orjson
+import pytest
+
+from app.middleware.auth_middleware import _decode, _encode, decode_token, generate_token
+
+
+def _segment(value):
+    return base64.urlsafe_b64encode(orjson.dumps(value)).rstrip(b'=').decode('ascii')
+
+
+def _replace_segment(token, index, value):
+    parts = token.split('.')
+    parts[index] = _segment(value)
+    return '.'.join(parts)
+
+
+def test_generated_token_decodes_with_claims(app):
+    token = generate_token(7, 'admin', email='a@b.co', name='A')
+    payload = _decode(token)
+    
+    assert payload['user_id'] == 7
+    assert payload['role'] == 'admin'
+    assert payload['email'] == 'a@b.co'
+    assert payload['exp'] - payload['iat'] == 3600
+    assert len(payload['jti']) == 32
+
+
+def test_token_is_compatible_with_pyjwt(app):
+    token = generate_token(1, 'user')
+    
+    assert jwt.decode(token, 'test-secret', algorithms=['HS256'])['user_id'] == 1
+    
+    issued = jwt.encode({'user_id': 2, 'role': 'user', 'exp': int(time.time()) + 60},
+                        'test-secret', algorithm='HS256')
+    assert _decode(issued)['user_id'] == 2
+
+
+def test_each_token_gets_a_unique_jti(app):
+    assert _decode(generate_token(1, 'user'))['jti'] != _decode(generate_token(1, 'user'))['jti']
+
+
+def test_tampered_payload_is_rejected(app):
+    token = generate_token(1, 'user')
+    payload = _decode(token)
+    payload['role'] = 'admin'
+    
+    with pytest.raises(jwt.InvalidSignatureError):
+        _decode(_replace_segment(token, 1, payload))
+
+
+def test_tampered_signature_is_rejected(app):
+    token = generate_token(1, 'user')
+    header, payload, signature = token.split('.')
+    flipped = ('A' if signature[0] != 'A' else 'B') + signature[1:]
+    
+    with pytest.raises(jwt.InvalidSignatureError):
+        _decode(f'{header}.{payload}.{flipped}')
+
+
+def test_token_signed_with_other_secret_is_rejected(app):
+    token = jwt.encode({'user_id': 1, 'exp': int(time.time()) + 60}, 'other-secret', algorithm='HS256')
+    
+    with pytest.raises(jwt.InvalidSignatureError):
+        _decode(token)
+
+
+def test_expired_token_is_rejected(app):
+    token = _encode({'user_id': 1, 'role': 'user', 'exp': int(time.time()) - 1})
+    
+    with pytest.raises(jwt.ExpiredSignatureError):
+        _decode(token)
+
+
+def test_missing_exp_is_rejected(app):
+    with pytest.raises(jwt.MissingRequiredClaimError):
+        _decode(_encode({'user_id': 1}))
+
+
+@pytest.mark.parametrize('exp', ['9999999999', True, [9999999999]])
+def test_non_numeric_exp_is_rejected(app, exp):
+    with pytest.raises(jwt.DecodeError):
+        _decode(_encode({'user_id': 1, 'exp': exp}))
+
+
+@pytest.mark.parametrize('alg', ['none', 'HS512', 'RS256'])
+def test_other_algorithms_are_rejected(app, alg):
+    token = generate_token(1, 'user')
+    
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        _decode(_replace_segment(token, 0, {'alg': alg, 'typ': 'JWT'}))
+
+
+def test_unsigned_token_is_rejected(app):
+    header = _segment({'alg': 'none', 'typ': 'JWT'})
+    payload = _segment({'user_id': 1, 'exp': int(time.time()) + 60})
+    
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        _decode(f'{header}.{payload}.')
+
+
+@pytest.mark.parametrize('token', ['', 'abc', 'a.b', 'a.b.c', 'ä.b.c', '..'])
+def test_malformed_token_is_rejected(app, token):
+    with pytest.raises(jwt.InvalidTokenError):
+        _decode(token)
+
+
+def test_decode_token_returns_none_for_invalid_tokens(app):
+    expired = _encode({'user_id': 1, 'exp': int(time.time()) - 1})
+    
+    with app.app_context():
+        assert decode_token(generate_token(3, 'user'))['user_id'] == 3
+        assert decode_token(expired) is None
+        assert decode_token('not-a-token') is None
+
+
+def test_decode_token_does_not_cache_rejected_tokens(app):
+    token = generate_token(1, 'user')
+    tampered = _replace_segment(token, 1, {**_decode(token), 'role': 'admin'})
+    
+    with app.app_context():
+        assert decode_token(tampered) is None
+        assert decode_token(tampered) is None
+
+
+def test_cached_token_expires_with_its_exp(app, monkeypatch):
+    token = generate_token(1, 'user')
+    now = time.time()
+    
+    with app.app_context():
+        assert decode_token(token) is not None
+        
+        # Cached claims are not trusted past exp
+        monkeypatch.setattr(time, 'time', lambda: now + 7200)
+        assert decode_token(token) is None
@@ -0,0 +1,105 @@
+"""
+Email lookup cache tests
+Lookups run against the SQLite fixture database, which compares
+emails case-sensitively (as PostgreSQL does)
+"""
+
+import pytest
+
+from app.models import user_model
+from app.models.user_model import UserModel
+
+
+@pytest.fixture
+def users(sql_db, monkeypatch):
+    """
+    One registered user; counts email lookups that reach the database
+    """
+    lookups = []
+    find_by_email = UserModel.find_by_email
+    
+    def counting(email):
+        lookups.append(email)
+        return find_by_email(email)
+    
+    user_model._email_cache.clear()
+    user_model._email_keys.clear()
+    monkeypatch.setattr(UserModel, 'find_by_email', staticmethod(counting))
+    monkeypatch.setattr(user_model.user_cache, 'invalidate', lambda user_id: None)
+    
+    sql_db.add_user(1, 'Bob', email='bob@x.com')
+    
+    yield sql_db, lookups
+    
+    user_model._email_cache.clear()
+    user_model._email_keys.clear()
+
+
+def test_hits_and_misses_are_cached(users):
+    _, lookups = users
+    
+    assert UserModel.find_by_email_cached('bob@x.com')['id'] == 1
+    assert UserModel.find_by_email_cached('bob@x.com')['id'] == 1
+    assert UserModel.find_by_email_cached('nobody@x.com') is None
+    assert UserModel.find_by_email_cached('nobody@x.com') is None
+    
+    assert lookups == ['bob@x.com', 'nobody@x.com']
+
+
+def test_any_case_finds_the_user_through_one_entry(users):
+    _, lookups = users
+    
+    assert UserModel.find_by_email_cached(' Bob@X.com ')['id'] == 1
+    assert UserModel.find_by_email_cached('BOB@x.com')['id'] == 1
+    
+    assert lookups == ['bob@x.com']
+    assert list(user_model._email_cache) == ['bob@x.com']
+
+
+def test_create_stores_the_normalized_email(users):
+    sql_db, _ = users
+    
+    assert UserModel.find_by_email_cached('new@x.com') is None
+    
+    user_id = UserModel.create('New@X.com', 'hash', 'New')
+    
+    stored = sql_db.conn.execute('SELECT email FROM users WHERE id = ?', (user_id,)).fetchone()
+    assert stored == ('new@x.com',)
+    assert UserModel.find_by_email_cached('NEW@x.com')['id'] == user_id
+
+
+def test_lookup_racing_an_invalidation_is_not_stored(users, monkeypatch):
+    sql_db, _ = users
+    lookup = UserModel.find_by_email
+    
+    def racing(email):
+        result = lookup(email)
+        # create() commits and invalidates while this miss is in flight
+        sql_db.add_user(3, 'Race', email=email)
+        UserModel.invalidate_email(email)
+        return result
+    
+    monkeypatch.setattr(UserModel, 'find_by_email', staticmethod(racing))
+    assert UserModel.find_by_email_cached('race@x.com') is None
+    
+    monkeypatch.setattr(UserModel, 'find_by_email', staticmethod(lookup))
+    assert UserModel.find_by_email_cached('race@x.com')['id'] == 3
+
+
+def test_user_update_invalidates_by_id(users):
+    _, lookups = users
+    
+    UserModel.find_by_email_cached('bob@x.com')
+    UserModel.update(1, name='Robert')
+    
+    assert 'bob@x.com' not in user_model._email_cache
+    assert 1 not in user_model._email_keys
+    assert UserModel.find_by_email_cached('bob@x.com')['name'] == 'Robert'
+    assert lookups == ['bob@x.com', 'bob@x.com']
+
+
+def test_invalidating_an_uncached_user_is_a_no_op(users):
+    UserModel.find_by_email_cached('nobody@x.com')
+    UserModel._invalidate(2)
+    
+    assert 'nobody@x.com' in user_model._email_cache
@@ -0,0 +1,278 @@
+"""
+Query helper tests
+Database connections are replaced by recording doubles
+"""
+
+import pytest
+
+from app import extensions
+from app.extensions import _postgres_prepared_query, execute_many, execute_query, stream_query
+
+
+class RecordingCursor:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.executed = []
+        self.description = [('count',)]
+        self.closed = False
+    
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+    
+    def fetchone(self):
+        return {'count': 1}
+    
+    def close(self):
+        self.closed = True
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.cursors = []
+    
+    def cursor(self, **kwargs):
+        cursor = RecordingCursor(**kwargs)
+        self.cursors.append(cursor)
+        return cursor
+
+
+def test_placeholders_are_numbered_in_order():
+    db, cursor = RecordingConnection(), RecordingCursor()
+    query = 'SELECT id FROM tasks WHERE user_id = %s AND status = COALESCE(%s, status) LIMIT %s'
+    
+    statement = _postgres_prepared_query(db, cursor, query)
+    
+    prepare = cursor.executed[0][0]
+    assert prepare.startswith('PREPARE stmt_')
+    assert prepare.endswith(
+        'AS SELECT id FROM tasks WHERE user_id = $1 AND status = COALESCE($2, status) LIMIT $3'
+    )
+    name = prepare.split()[1]
+    assert statement == f'EXECUTE {name} (%s, %s, %s)'
+
+
+def test_query_without_placeholders():
+    db, cursor = RecordingConnection(), RecordingCursor()
+    
+    statement = _postgres_prepared_query(db, cursor, 'SELECT 1')
+    
+    assert cursor.executed[0][0].endswith('AS SELECT 1')
+    assert statement == 'EXECUTE ' + cursor.executed[0][0].split()[1]
+
+
+def test_statement_is_prepared_once_per_connection():
+    query = 'SELECT * FROM users WHERE id = %s'
+    first, second = RecordingConnection(), RecordingConnection()
+    cursor = RecordingCursor()
+    
+    statement = _postgres_prepared_query(first, cursor, query)
+    assert _postgres_prepared_query(first, cursor, query) == statement
+    assert len(cursor.executed) == 1
+    
+    # A different connection is a different server session
+    assert _postgres_prepared_query(second, cursor, query) == statement
+    assert len(cursor.executed) == 2
+
+
+def test_different_queries_get_different_statements():
+    db, cursor = RecordingConnection(), RecordingCursor()
+    
+    a = _postgres_prepared_query(db, cursor, 'SELECT 1 WHERE 1 = %s')
+    b = _postgres_prepared_query(db, cursor, 'SELECT 2 WHERE 2 = %s')
+    
+    assert a != b
+
+
+@pytest.fixture
+def mysql(monkeypatch):
+    db = RecordingConnection()
+    monkeypatch.setattr(extensions, 'db_type', 'mysql')
+    monkeypatch.setattr(extensions, 'get_db', lambda: db)
+    return db
+
+
+def test_mysql_prepared_reads_use_the_text_protocol(mysql):
+    result = execute_query('SELECT COUNT(*) AS count FROM tasks WHERE user_id = %s', (1,),
+                           fetch_one=True, prepared=True)
+    
+    assert result == {'count': 1}
+    cursor = mysql.cursors[0]
+    assert cursor.kwargs == {'dictionary': True}
+    assert cursor.executed == [('SELECT COUNT(*) AS count FROM tasks WHERE user_id = %s', (1,))]
+    assert cursor.closed
+
+
+class FakePgConnection:
+    closed = 0
+    autocommit = False
+    
+    class info:
+        transaction_status = 0  # TRANSACTION_STATUS_IDLE
+    
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def pg_connects(monkeypatch):
+    from psycopg2 import pool
+    
+    opened = []
+    
+    def connect(*args, **kwargs):
+        conn = FakePgConnection()
+        opened.append(conn)
+        return conn
+    
+    monkeypatch.setattr(pool.psycopg2, 'connect', connect)
+    monkeypatch.setattr(extensions, 'db_pool', None)
+    monkeypatch.setattr(extensions, 'db_type', 'mysql')
+    
+    return opened
+
+
+@pytest.mark.parametrize('config, expected', [
+    ({'DB_POOL_MAX': 20, 'DB_POOL_MIN': 1, 'PREWARM_SIZE': 10}, 10),
+    ({'DB_POOL_MAX': 20, 'DB_POOL_MIN': 1, 'PREWARM_POOL': False}, 1),
+    ({'DB_POOL_MAX': 5, 'DB_POOL_MIN': 1, 'PREWARM_SIZE': 10}, 5),
+    ({'DB_POOL_MAX': 8}, 8),
+])
+def test_postgres_pool_keeps_warmed_connections(app, pg_connects, config, expected):
+    app.config.update(DB_TYPE='postgresql', **config)
+    
+    extensions.init_db(app)
+    db_pool = extensions.db_pool
+    
+    assert len(pg_connects) == expected
+    assert db_pool.minconn == expected
+    
+    # Checking every warmed connection out and back in closes none of them
+    connections = [db_pool.getconn() for _ in range(expected)]
+    for conn in connections:
+        db_pool.putconn(conn)
+    
+    assert len(pg_connects) == expected
+    assert not any(conn.closed for conn in pg_connects)
+
+
+class TransactionConnection(RecordingConnection):
+    """
+    Records transaction calls; statements containing "fail" raise
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.autocommit = True
+        self.calls = []
+    
+    def cursor(self, **kwargs):
+        cursor = super().cursor(**kwargs)
+        cursor.rowcount = 0
+        
+        def execute(query, params=None):
+            if 'fail' in query:
+                raise RuntimeError('statement failed')
+            cursor.executed.append((query, params))
+            cursor.rowcount = len(cursor.executed)
+        
+        cursor.execute = execute
+        return cursor
+    
+    def start_transaction(self):
+        self.calls.append('begin')
+    
+    def commit(self):
+        self.calls.append(('commit', self.autocommit))
+    
+    def rollback(self):
+        self.calls.append(('rollback', self.autocommit))
+
+
+@pytest.fixture(params=['mysql', 'postgresql'])
+def tx_db(request, monkeypatch):
+    db = TransactionConnection()
+    monkeypatch.setattr(extensions, 'db_type', request.param)
+    monkeypatch.setattr(extensions, 'get_db', lambda: db)
+    return db
+
+
+def test_execute_many_commits_once_and_restores_autocommit(tx_db):
+    rowcounts = execute_many([
+        ('DELETE FROM tasks WHERE user_id = %s', (1,)),
+        ('DELETE FROM users WHERE id = %s', (1,)),
+    ])
+    
+    assert rowcounts == [1, 2]
+    assert tx_db.calls[-1] == ('commit', extensions.db_type == 'mysql')
+    assert tx_db.autocommit
+    assert tx_db.cursors[0].closed
+
+
+def test_execute_many_rolls_back_on_error(tx_db):
+    with pytest.raises(RuntimeError):
+        execute_many([
+            ('DELETE FROM tasks WHERE user_id = %s', (1,)),
+            ('fail', ()),
+        ])
+    
+    assert [call[0] for call in tx_db.calls if call != 'begin'] == ['rollback']
+    assert tx_db.autocommit
+    assert tx_db.cursors[0].closed
+
+
+class StreamCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.closed = False
+    
+    def execute(self, query, params=None):
+        if 'fail' in query:
+            raise RuntimeError('syntax error')
+    
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+    
+    def fetchall(self):
+        return self.fetchmany(len(self.rows))
+    
+    def __iter__(self):
+        return iter(self.fetchall())
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def stream_db(tx_db):
+    tx_db.stream_cursor = StreamCursor({'id': i} for i in range(5))
+    tx_db.cursor = lambda **kwargs: tx_db.stream_cursor
+    return tx_db
+
+
+def test_stream_query_raises_before_the_first_row(stream_db):
+    with pytest.raises(RuntimeError, match='syntax error'):
+        stream_query('fail')
+    
+    assert stream_db.stream_cursor.closed
+    assert stream_db.autocommit
+
+
+def test_stream_query_yields_every_row_then_cleans_up(stream_db):
+    rows = stream_query('SELECT id FROM tasks', itersize=2)
+    
+    assert list(rows) == [{'id': i} for i in range(5)]
+    assert stream_db.stream_cursor.closed
+    assert stream_db.autocommit
+
+
+def test_stream_closed_early_releases_the_cursor(stream_db):
+    rows = stream_query('SELECT id FROM tasks', itersize=2)
+    next(rows)
+    rows.close()
+    
+    # MySQL must read the rest of the result before the connection is reused
+    if extensions.db_type == 'mysql':
+        assert stream_db.stream_cursor.rows == []
+    assert stream_db.stream_cursor.closed
+    assert stream_db.autocommit
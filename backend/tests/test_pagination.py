@@ -0,0 +1,150 @@
+"""
+Keyset pagination tests
+Cursor encoding, plus paging through the models' own keyset SQL
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.task_model import TaskModel
+from app.utils.pagination import decode_cursor, encode_cursor, next_cursor
+
+TIED = datetime(2024, 3, 1, 12, 0, 0)
+
+
+def _expected(rows):
+    # ORDER BY created_at DESC, id DESC
+    return [task_id for task_id, _ in sorted(rows, key=lambda row: (row[1], row[0]), reverse=True)]
+
+
+def _page_through(fetch_page, limit):
+    """
+    Follow next_cursor like a client; returns the task IDs per page
+    """
+    pages = []
+    after_created_at = after_id = None
+    
+    while True:
+        columns, rows = fetch_page(limit, after_created_at, after_id)
+        pages.append([row[columns.index('id')] for row in rows])
+        
+        cursor = next_cursor(columns, rows, limit)
+        if cursor is None:
+            return pages
+        
+        after_created_at, after_id = decode_cursor(cursor)
+        assert len(pages) <= 100, 'cursor is not advancing'
+
+
+@pytest.fixture
+def tied_tasks(sql_db):
+    """
+    Tasks of user 1 with most created_at values tied, plus rows of
+    another user interleaved by time
+    """
+    sql_db.add_user(1, 'A')
+    sql_db.add_user(2, 'B')
+    
+    rows = [(task_id, TIED) for task_id in range(1, 8)]
+    rows += [(8, TIED + timedelta(microseconds=1)), (9, TIED - timedelta(seconds=1))]
+    
+    for task_id, created_at in rows:
+        sql_db.add_task(task_id, 1, created_at)
+    for task_id in range(10, 14):
+        sql_db.add_task(task_id, 2, TIED)
+    
+    return rows
+
+
+def test_cursor_round_trip_keeps_microseconds():
+    created_at = datetime(2024, 5, 17, 13, 45, 12, 123456)
+    
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2024, 1, 1, 0, 0, 0, 999999), 10 ** 12)
+    
+    assert set(cursor) <= set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_=')
+
+
+@pytest.mark.parametrize('cursor', [
+    'zzz',
+    '!!!!',
+    encode_cursor(datetime(2024, 1, 1), 1)[:-4],
+    'MjAyNC0wMS0wMQ==',  # "2024-01-01" without an id
+    'bm90LWEtZGF0ZXwx',  # "not-a-date|1"
+])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match='Invalid pagination cursor'):
+        decode_cursor(cursor)
+
+
+def test_next_cursor_is_none_on_short_page():
+    columns = ('id', 'created_at')
+    
+    assert next_cursor(columns, [(1, TIED)], 2) is None
+    assert next_cursor(columns, [], 2) is None
+
+
+def test_next_cursor_points_at_last_row():
+    columns = ('id', 'title', 'created_at')
+    rows = [(5, 'a', TIED), (4, 'b', TIED - timedelta(days=1))]
+    
+    assert decode_cursor(next_cursor(columns, rows, 2)) == (TIED - timedelta(days=1), 4)
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 4, 9, 10])
+def test_user_pages_return_every_row_once_in_order(tied_tasks, limit):
+    def fetch_page(limit, after_created_at, after_id):
+        return TaskModel.find_by_user(
+            1, limit=limit, after_created_at=after_created_at, after_id=after_id
+        )
+    
+    pages = _page_through(fetch_page, limit)
+    
+    assert [task_id for page in pages for task_id in page] == _expected(tied_tasks)
+    assert all(len(page) <= limit for page in pages)
+
+
+@pytest.mark.parametrize('limit', [1, 3, 13])
+def test_all_task_pages_return_every_row_once_in_order(tied_tasks, limit):
+    def fetch_page(limit, after_created_at, after_id):
+        return TaskModel.find_all(
+            limit=limit, after_created_at=after_created_at, after_id=after_id
+        )
+    
+    pages = _page_through(fetch_page, limit)
+    every_task = tied_tasks + [(task_id, TIED) for task_id in range(10, 14)]
+    
+    assert [task_id for page in pages for task_id in page] == _expected(every_task)
+
+
+def test_page_boundary_inside_a_tie_keeps_lower_ids(sql_db):
+    sql_db.add_user(1, 'A')
+    for task_id in (1, 2, 3):
+        sql_db.add_task(task_id, 1, TIED)
+    
+    columns, first = TaskModel.find_by_user(1, limit=1)
+    after_created_at, after_id = decode_cursor(next_cursor(columns, first, 1))
+    _, second = TaskModel.find_by_user(
+        1, limit=2, after_created_at=after_created_at, after_id=after_id
+    )
+    
+    assert [row[0] for row in first] == [3]
+    assert [row[0] for row in second] == [2, 1]
+
+
+def test_keyset_pages_keep_the_status_filter(sql_db):
+    sql_db.add_user(1, 'A')
+    for task_id in range(1, 7):
+        sql_db.add_task(task_id, 1, TIED, status='completed' if task_id % 2 else 'pending')
+    
+    def fetch_page(limit, after_created_at, after_id):
+        return TaskModel.find_by_user(
+            1, status='completed', limit=limit,
+            after_created_at=after_created_at, after_id=after_id
+        )
+    
+    assert _page_through(fetch_page, 2) == [[5, 3], [1]]
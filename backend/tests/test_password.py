@@ -0,0 +1,56 @@
+"""
+Password hashing tests
+Covers the bcrypt -> argon2id migration path
+"""
+
+import bcrypt
+import pytest
+from argon2 import PasswordHasher
+
+from app.utils.password import hash_password, hash_password_async, needs_rehash, verify_password
+
+
+@pytest.fixture(scope='module')
+def bcrypt_hash():
+    return bcrypt.hashpw(b'Passw0rdX', bcrypt.gensalt(rounds=4)).decode('utf-8')
+
+
+@pytest.fixture(scope='module')
+def argon2_hash():
+    return hash_password('Passw0rdX')
+
+
+def test_new_hashes_are_argon2id(argon2_hash):
+    assert argon2_hash.startswith('$argon2id$')
+    assert verify_password('Passw0rdX', argon2_hash)
+    assert not verify_password('wrong', argon2_hash)
+
+
+def test_current_argon2_hash_needs_no_rehash(argon2_hash):
+    assert not needs_rehash(argon2_hash)
+
+
+def test_async_hash_verifies():
+    assert verify_password('Passw0rdX', hash_password_async('Passw0rdX').result())
+
+
+def test_bcrypt_hash_verifies_and_needs_rehash(bcrypt_hash):
+    assert verify_password('Passw0rdX', bcrypt_hash)
+    assert not verify_password('wrong', bcrypt_hash)
+    assert needs_rehash(bcrypt_hash)
+
+
+def test_argon2_hash_with_outdated_parameters_needs_rehash():
+    outdated = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1).hash('Passw0rdX')
+    
+    assert verify_password('Passw0rdX', outdated)
+    assert needs_rehash(outdated)
+
+
+@pytest.mark.parametrize('password_hash', ['', 'plaintext', '$2b$12$truncated', '$argon2id$v=19$m=8'])
+def test_malformed_hash_does_not_verify(password_hash):
+    assert not verify_password('Passw0rdX', password_hash)
+
+
+def test_malformed_argon2_hash_needs_no_rehash():
+    assert not needs_rehash('$argon2id$v=19$m=8')
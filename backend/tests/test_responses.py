@@ -0,0 +1,104 @@
+"""
+Response helper tests: streamed JSON framing and safe_route
+"""
+
+from datetime import datetime
+
+import orjson
+import pytest
+
+from app.middleware.auth_middleware import generate_token, token_required
+from app.utils.responses import safe_route, streamed_response, success_response
+
+
+def _stream_body(app, **kwargs):
+    with app.test_request_context():
+        response = streamed_response(**kwargs)
+        return b''.join(response.response)
+
+
+@pytest.mark.parametrize('items', [
+    [],
+    [{'id': 1}],
+    [{'id': i, 'created_at': datetime(2024, 1, 1, 0, 0, i)} for i in range(5)],
+])
+@pytest.mark.parametrize('data', [None, {}, {'total': 5, 'pagination': {'page': 1}}])
+@pytest.mark.parametrize('count_key', [None, 'total_streamed'])
+def test_streamed_body_is_valid_json(app, items, data, count_key):
+    body = orjson.loads(_stream_body(
+        app, message='ok', key='tasks', items=iter(items), data=data, count_key=count_key
+    ))
+    
+    assert body['success'] is True
+    assert body['message'] == 'ok'
+    assert len(body['data']['tasks']) == len(items)
+    for field, value in (data or {}).items():
+        assert body['data'][field] == value
+    if count_key:
+        assert body['data'][count_key] == len(items)
+
+
+def test_streamed_body_matches_success_response(app):
+    items = [{'id': 1, 'created_at': datetime(2024, 1, 1, 12, 30)}, {'id': 2, 'title': 'a "quoted" <b>'}]
+    
+    streamed = orjson.loads(_stream_body(app, message='ok', key='tasks', items=items, data={'total': 2}))
+    
+    with app.test_request_context():
+        plain = orjson.loads(success_response('ok', data={'total': 2, 'tasks': items}).get_data())
+    
+    assert streamed == plain
+
+
+def test_stream_error_after_start_is_logged_and_raised(app, caplog):
+    def items():
+        yield {'id': 1}
+        raise RuntimeError('connection lost')
+    
+    with pytest.raises(RuntimeError):
+        _stream_body(app, message='ok', key='tasks', items=items())
+    
+    assert 'Streamed response error after 1 items: connection lost' in caplog.text
+
+
+def test_safe_route_turns_exceptions_into_500(app, caplog):
+    @safe_route('Thing', 'Failed to get thing')
+    def view():
+        raise RuntimeError('boom')
+    
+    with app.test_request_context():
+        response = view()
+    
+    assert response.status_code == 500
+    assert orjson.loads(response.get_data()) == {'success': False, 'error': 'Failed to get thing'}
+    assert 'Thing error: boom' in caplog.text
+    assert view.__name__ == 'view'
+
+
+def test_safe_route_default_message_and_passthrough(app):
+    @safe_route('Login')
+    def ok(value):
+        return value
+    
+    @safe_route('Login')
+    def fails():
+        raise ValueError
+    
+    with app.test_request_context():
+        assert ok(3) == 3
+        assert orjson.loads(fails().get_data())['error'] == 'Login failed'
+
+
+def test_safe_route_below_token_required_keeps_the_401(app):
+    @token_required
+    @safe_route('Thing')
+    def view(current_user):
+        raise RuntimeError('boom')
+    
+    with app.test_request_context():
+        assert view().status_code == 401
+    
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {generate_token(1, "user")}'}
+    
+    with app.test_request_context(headers=headers):
+        assert view().status_code == 500
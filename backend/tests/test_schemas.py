@@ -0,0 +1,73 @@
+"""
+Request body decoding tests
+"""
+
+import pytest
+from msgspec import UNSET
+
+from app.utils.schemas import LoginReq, RegisterReq, TaskCreateReq, TaskUpdateReq, parse_body
+
+
+def _parse(app, req_type, body):
+    with app.test_request_context(method='POST', data=body, content_type='application/json'):
+        return parse_body(req_type)
+
+
+def test_valid_body_decodes(app):
+    req, error = _parse(app, TaskCreateReq, b'{"title": "Write tests", "status": "completed"}')
+    
+    assert error is None
+    assert req == TaskCreateReq(title='Write tests', description='', status='completed')
+
+
+def test_missing_fields_take_their_defaults(app):
+    req, error = _parse(app, RegisterReq, b'{"email": "a@b.co"}')
+    
+    assert error is None
+    assert (req.email, req.password, req.name, req.role) == ('a@b.co', '', '', 'user')
+
+
+def test_update_fields_left_out_stay_unset(app):
+    req, error = _parse(app, TaskUpdateReq, b'{"description": null}')
+    
+    assert error is None
+    assert req.title is UNSET and req.status is UNSET
+    assert req.description is None
+
+
+def test_unknown_fields_are_ignored(app):
+    req, error = _parse(app, LoginReq, b'{"email": "a@b.co", "password": "x", "remember": true}')
+    
+    assert error is None
+    assert req == LoginReq(email='a@b.co', password='x')
+
+
+@pytest.mark.parametrize('req_type, body, path', [
+    (LoginReq, b'{"email": 5, "password": "x"}', '$.email'),
+    (TaskCreateReq, b'{"title": ["a"]}', '$.title'),
+    (TaskUpdateReq, b'{"status": null}', '$.status'),
+    (RegisterReq, b'{"email": "a@b.co", "role": false}', '$.role'),
+])
+def test_wrong_type_names_the_field(app, req_type, body, path):
+    req, error = _parse(app, req_type, body)
+    
+    assert req is None
+    assert error.startswith('Invalid request body: Expected `str`')
+    assert error.endswith(f'- at `{path}`')
+
+
+@pytest.mark.parametrize('body', [b'[]', b'"text"', b'1'])
+def test_non_object_body_is_rejected(app, body):
+    req, error = _parse(app, LoginReq, body)
+    
+    assert req is None
+    assert error.startswith('Invalid request body: Expected `object`')
+
+
+@pytest.mark.parametrize('body', [b'{', b'{"email": }', b'not json'])
+def test_invalid_json_is_rejected(app, body):
+    assert _parse(app, LoginReq, body) == (None, 'Request body must be valid JSON')
+
+
+def test_empty_body_is_rejected(app):
+    assert _parse(app, LoginReq, b'') == (None, 'Request body is required')
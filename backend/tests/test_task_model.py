@@ -0,0 +1,124 @@
+"""
+Task listing query tests
+Queries run against the SQLite fixture database
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.task_model import TaskModel
+
+START = datetime(2024, 3, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def tasks(sql_db):
+    """
+    Five tasks of user 1 (odd IDs completed) and two of user 2
+    """
+    sql_db.add_user(1, 'A')
+    sql_db.add_user(2, 'B')
+    
+    for task_id in range(1, 6):
+        sql_db.add_task(task_id, 1, START + timedelta(minutes=task_id),
+                        status='completed' if task_id % 2 else 'pending')
+    for task_id in (6, 7):
+        sql_db.add_task(task_id, 2, START + timedelta(minutes=task_id))
+    
+    return sql_db
+
+
+def test_user_page_carries_the_total(tasks):
+    columns, rows, total = TaskModel.find_by_user_with_total(1, limit=2, offset=2)
+    
+    assert 'total' not in columns
+    assert len(columns) == len(rows[0])
+    assert [row[0] for row in rows] == [3, 2]
+    assert total == 5
+
+
+def test_user_total_respects_the_status_filter(tasks):
+    _, rows, total = TaskModel.find_by_user_with_total(1, status='completed', limit=2)
+    
+    assert [row[0] for row in rows] == [5, 3]
+    assert total == 3
+
+
+def test_user_total_past_the_last_page(tasks):
+    _, rows, total = TaskModel.find_by_user_with_total(1, limit=2, offset=10)
+    
+    assert rows == []
+    assert total == 5
+
+
+def test_user_without_tasks(tasks):
+    assert TaskModel.find_by_user_with_total(3)[1:] == ([], 0)
+
+
+def test_keyset_user_page_seeks_and_counts_separately(tasks):
+    columns, rows, total = TaskModel.find_by_user_with_total(
+        1, limit=2, after_created_at=START + timedelta(minutes=4), after_id=4
+    )
+    
+    assert [row[0] for row in rows] == [3, 2]
+    assert total == 5
+    
+    page_query, count_query = tasks.queries[-2:]
+    assert 'OVER' not in page_query
+    assert 'COUNT(*)' in count_query
+
+
+@pytest.mark.parametrize('include_user', [False, True])
+def test_all_tasks_page_carries_the_total(tasks, include_user):
+    columns, rows, total = TaskModel.find_all_with_total(
+        limit=3, offset=1, include_user=include_user
+    )
+    
+    assert ('user_name' in columns) is include_user
+    assert 'total' not in columns
+    assert [row[0] for row in rows] == [6, 5, 4]
+    assert total == 7
+
+
+def test_all_tasks_filters_and_past_the_last_page(tasks):
+    assert TaskModel.find_all_with_total(user_id=2)[2] == 2
+    assert TaskModel.find_all_with_total(status='pending', offset=50)[1:] == ([], 4)
+
+
+def test_keyset_all_tasks_page_seeks_and_counts_separately(tasks):
+    columns, rows, total = TaskModel.find_all_with_total(
+        limit=2, after_created_at=START + timedelta(minutes=6), after_id=6,
+        include_user=True
+    )
+    
+    assert [row[0] for row in rows] == [5, 4]
+    assert rows[0][columns.index('user_name')] == 'A'
+    assert total == 7
+    assert 'OVER' not in tasks.queries[-2]
+
+
+@pytest.mark.parametrize('include_user', [False, True])
+def test_stream_of_all_tasks(tasks, include_user):
+    rows = list(TaskModel.iter_all(status='pending', limit=2, offset=1, include_user=include_user))
+    
+    assert [row['id'] for row in rows] == [6, 4]
+    assert ('user_name' in rows[0]) is include_user
+
+
+def test_listing_queries_are_built_once(tasks):
+    TaskModel.find_all(limit=1)
+    TaskModel.find_all(limit=1)
+    TaskModel.find_all(limit=1, after_created_at=START, after_id=1, include_user=True)
+    TaskModel.find_all(limit=1, after_created_at=START, after_id=1, include_user=True)
+    
+    first, second, third, fourth = tasks.queries[-4:]
+    assert first is second
+    assert third is fourth
+
+
+def test_total_queries_are_built_once(tasks):
+    TaskModel.find_all_with_total(limit=1, include_user=True)
+    TaskModel.find_all_with_total(limit=1, include_user=True)
+    
+    assert tasks.queries[-1] is tasks.queries[-2]
@@ -0,0 +1,134 @@
+"""
+Token validation cache and revocation tests (in-process and Redis)
+"""
+
+import time
+
+import pytest
+
+from app.middleware.auth_middleware import generate_token
+from app.routes.auth_routes import auth_bp
+from app.utils import token_cache
+from app.utils.token_cache import is_revoked, revoke, validate_cached
+
+
+class FakeRedis:
+    """
+    Minimal in-memory stand-in for the redis client methods used
+    """
+    
+    def __init__(self, fail=False):
+        self.data = {}
+        self.fail = fail
+    
+    def _check(self):
+        if self.fail:
+            raise ConnectionError('redis down')
+    
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+    
+    def setex(self, key, ttl, value):
+        self._check()
+        self.data[key] = value
+    
+    def exists(self, key):
+        self._check()
+        return int(key in self.data)
+
+
+class CountingVerify:
+    def __init__(self, exp_in=60):
+        self.calls = 0
+        self.exp_in = exp_in
+    
+    def __call__(self, token):
+        self.calls += 1
+        return {'user_id': 1, 'exp': time.time() + self.exp_in}
+
+
+def test_local_cache_verifies_once():
+    verify = CountingVerify()
+    
+    assert validate_cached('tok', verify)['user_id'] == 1
+    assert validate_cached('tok', verify)['user_id'] == 1
+    assert verify.calls == 1
+
+
+def test_local_cache_reverifies_expired_claims():
+    verify = CountingVerify(exp_in=-1)
+    
+    validate_cached('tok', verify)
+    validate_cached('tok', verify)
+    
+    assert verify.calls == 2
+
+
+def test_local_revocation():
+    assert not is_revoked('jti-1')
+    assert revoke('jti-1', time.time() + 60) is True
+    assert is_revoked('jti-1')
+    assert not is_revoked('jti-2')
+
+
+def test_revoke_without_jti_is_a_no_op():
+    assert revoke(None, time.time() + 60) is False
+    assert not is_revoked(None)
+
+
+def test_redis_cache_and_revocation():
+    token_cache._redis = FakeRedis()
+    verify = CountingVerify()
+    
+    validate_cached('tok', verify)
+    validate_cached('tok', verify)
+    assert verify.calls == 1
+    
+    assert revoke('jti-1', time.time() + 60) is True
+    assert is_revoked('jti-1')
+    assert 'revoked:jti-1' in token_cache._redis.data
+
+
+def test_redis_outage_fails_open_and_reports_failed_revocation():
+    token_cache._redis = FakeRedis(fail=True)
+    verify = CountingVerify()
+    
+    assert validate_cached('tok', verify)['user_id'] == 1
+    assert not is_revoked('jti-1')
+    assert revoke('jti-1', time.time() + 60) is False
+
+
+@pytest.fixture
+def client(app):
+    app.register_blueprint(auth_bp, url_prefix='/api/v1/auth')
+    
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {generate_token(1, "user")}'}
+    
+    return app.test_client(), headers
+
+
+def test_logout_revokes_the_token(client):
+    client, headers = client
+    
+    assert client.post('/api/v1/auth/logout', headers=headers).status_code == 200
+    
+    response = client.post('/api/v1/auth/logout', headers=headers)
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'Token has been revoked'
+
+
+def test_logout_reports_a_failed_revocation(client, monkeypatch):
+    client, headers = client
+    monkeypatch.setattr(token_cache, '_redis', FakeRedis())
+    
+    # Redis goes down after the token has been checked
+    def failing_setex(key, ttl, value):
+        raise ConnectionError('redis down')
+    
+    monkeypatch.setattr(token_cache._redis, 'setex', failing_setex)
+    response = client.post('/api/v1/auth/logout', headers=headers)
+    
+    assert response.status_code == 503
+    assert response.get_json()['error'] == 'Logout failed, token could not be revoked'
@@ -0,0 +1,35 @@
+"""
+Input validation tests
+"""
+
+import pytest
+
+from app.utils.validators import validate_task_fields, validate_task_status
+
+
+@pytest.mark.parametrize('status', ['pending', 'in_progress', 'completed', 'cancelled'])
+def test_every_task_status_is_valid(status):
+    assert validate_task_status(status)
+    assert validate_task_fields('Title', status) == (True, None)
+
+
+@pytest.mark.parametrize('status', ['', None, 'done', 'Pending', 'pending '])
+def test_unknown_status_is_rejected(status):
+    assert not validate_task_status(status)
+    assert validate_task_fields('Title', status) == (
+        False, 'Invalid status. Must be one of: pending, in_progress, completed, cancelled'
+    )
+
+
+def test_title_length_limit():
+    assert validate_task_fields('x' * 200, 'pending') == (True, None)
+    assert validate_task_fields('x' * 201, 'pending') == (
+        False, 'Title must be less than 200 characters'
+    )
+
+
+def test_title_is_checked_before_status():
+    valid, error = validate_task_fields('x' * 201, 'done')
+    
+    assert not valid
+    assert error.startswith('Title')